@@ -9,144 +9,384 @@ import time
 import hmac
 import hashlib
 import base64
-from typing import Dict, List, Optional, Any
+import json
+import os
+import random
+import atexit
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
+from urllib.parse import urlencode
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import config
 
+# orjson is optional: same results, several times faster on big payloads
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumpb = orjson.dumps
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_dumpb(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# Config values bound once at import (call refresh_config() after changing them)
+_GAMMA_URL = config.GAMMA_API_URL
+_CLOB_URL = config.CLOB_API_URL
+_API_KEY = config.POLYMARKET_API_KEY
+_PASSPHRASE = config.POLYMARKET_PASSPHRASE
+_SECRET_BYTES = base64.b64decode(config.POLYMARKET_SECRET) if config.POLYMARKET_SECRET else b""
+
+
+def refresh_config():
+    """Re-read API URLs and credentials from config (e.g. after a reload)."""
+    global _GAMMA_URL, _CLOB_URL, _API_KEY, _PASSPHRASE, _SECRET_BYTES, _HMAC_PROTO
+    _GAMMA_URL = config.GAMMA_API_URL
+    _CLOB_URL = config.CLOB_API_URL
+    _API_KEY = config.POLYMARKET_API_KEY
+    _PASSPHRASE = config.POLYMARKET_PASSPHRASE
+    _SECRET_BYTES = base64.b64decode(config.POLYMARKET_SECRET) if config.POLYMARKET_SECRET else b""
+    _HMAC_PROTO = None
+    _sign.cache_clear()
+
 # =============================================================================
 # GAMMA API (Market data)
 # =============================================================================
 
+PAGE_SIZE = 100        # Gamma caps /markets pages at 100
+MAX_OFFSET = 30000     # Upper bound on open markets (~28000 today)
+# Parallel page requests: 16 on a 4-core runner, capped at 32. Each worker
+# parses its own page as it lands, so parsing overlaps other workers' I/O
+# (socket reads release the GIL); a separate parse pool would only add hops.
+FETCH_WORKERS = min(32, 4 * (os.cpu_count() or 4))
+WAVE_SIZE = 32         # Pages requested per wave before checking for the end
+PAGE_ATTEMPTS = 3      # Tries per listing page before the whole fetch fails
+IDS_PER_REQUEST = 50   # Market ids per bulk /markets?id=... request
+
+# One keep-alive session shared by every Gamma/CLOB call (thread-safe pool).
+# Retries only cover idempotent methods, so orders are never re-sent.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
+))
+
+# ETag cache: request key -> (etag, raw body). A 304 Not Modified re-parses
+# the stored bytes, so every caller gets its own objects (nothing shared to
+# mutate). Only market listing pages are persisted between runs; per-id
+# lookups are cached for this process only. All access under the lock.
+_PAGE_CACHE: Dict[str, Tuple[str, bytes]] = {}
+_page_cache_persist = set()  # Listing-page keys used by this process
+_page_cache_lock = threading.Lock()
+_page_cache_loaded = False
 
-def _fetch_page(url: str, params: dict) -> List[Dict]:
-    """Fetch a single page from Gamma API."""
+# Markets seen by the last full fetch, by id (serves fetch_markets_by_ids)
+_MARKET_INDEX: Dict[str, Dict] = {}
+
+
+def _load_page_cache():
+    """Load the persisted ETag cache once per process."""
+    global _page_cache_loaded
+    with _page_cache_lock:
+        if _page_cache_loaded:
+            return
+        _page_cache_loaded = True
+        if os.path.exists(config.GAMMA_CACHE_FILE):
+            try:
+                with open(config.GAMMA_CACHE_FILE, "rb") as f:
+                    for key, (etag, body) in _json_loads(f.read()).items():
+                        if isinstance(body, str):  # Skip the old parsed-body format
+                            _PAGE_CACHE[key] = (etag, body.encode("utf-8"))
+            except Exception as e:
+                print(f"[WARN] Could not load {config.GAMMA_CACHE_FILE}: {e}")
+        atexit.register(save_page_cache)
+
+
+def save_page_cache():
+    """Persist the listing pages used in this process (older entries are
+    dropped). Written to a temp file and renamed, so a crash mid-write
+    never leaves a corrupt cache behind."""
+    path = config.GAMMA_CACHE_FILE
+    tmp = f"{path}.{os.getpid()}.tmp"
     try:
-        resp = requests.get(url, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+        with _page_cache_lock:
+            data = {
+                k: (_PAGE_CACHE[k][0], _PAGE_CACHE[k][1].decode("utf-8"))
+                for k in _page_cache_persist if k in _PAGE_CACHE
+            }
+        if not data:
+            return
+        with open(tmp, "wb") as f:
+            f.write(_json_dumpb(data))
+        os.replace(tmp, path)
     except Exception as e:
-        print(f"[ERROR] _fetch_page: {e}")
-        return []
+        print(f"[WARN] Could not save {path}: {e}")
 
 
-def fetch_open_markets(limit: int = 500) -> List[Dict]:
-    """Fetch open markets from Gamma API (all markets, paginated)."""
-    all_markets = []
-    offset = 0
-    
-    while True:
-        url = f"{config.GAMMA_API_URL}/markets"
-        params = {
-            "closed": "false",
-            "limit": min(limit, 100),
-            "offset": offset,
-        }
-        
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            markets = resp.json()
-            
-            if not markets:
-                break
-            
-            all_markets.extend(markets)
-            offset += len(markets)
-            
-            if len(markets) < 100:
-                break
-                
-            time.sleep(0.1)  # Rate limiting
-            
-        except Exception as e:
-            print(f"[ERROR] fetch_open_markets: {e}")
-            break
+def _conditional_get(url: str, params: dict = None, timeout: int = 30,
+                     persist: bool = False) -> Any:
+    """GET with If-None-Match; a 304 re-parses the cached body (no download).
     
-    return all_markets
+    persist: keep this response in the on-disk cache (listing pages only).
+    """
+    _load_page_cache()
+    key = f"{url}?{urlencode(sorted(params.items()), doseq=True)}" if params else url
+    with _page_cache_lock:
+        if persist:
+            _page_cache_persist.add(key)
+        cached = _PAGE_CACHE.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    
+    resp = SESSION.get(url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached:
+        return _json_loads(cached[1])
+    resp.raise_for_status()
+    raw = resp.content
+    data = _json_loads(raw)
+    
+    etag = resp.headers.get("ETag")
+    if etag:
+        with _page_cache_lock:
+            _PAGE_CACHE[key] = (etag, raw)
+    return data
 
 
-def fetch_geo_markets_fast(max_workers: int = 5) -> List[Dict]:
-    """Fetch all open markets with parallel pagination.
+class MarketFetchError(RuntimeError):
+    """A market listing page could not be fetched (the list would be incomplete)."""
+
+
+def _fetch_page(url: str, params: dict, persist: bool = False) -> Optional[List[Dict]]:
+    """Fetch a single page from Gamma API (None if the request failed).
     
-    ~10x faster than fetch_open_markets by parallelizing page requests.
+    An empty list means the API really returned no markets; callers must
+    not confuse it with a failed request.
     """
-    url = f"{config.GAMMA_API_URL}/markets"
+    try:
+        return _conditional_get(url, params, timeout=30, persist=persist)
+    except (requests.RequestException, ValueError) as e:
+        print(f"[ERROR] _fetch_page: {e}")
+        return None
+
+
+def fetch_open_markets(limit: int = 500, use_cache: bool = False) -> List[Dict]:
+    """Fetch open markets from Gamma API (all markets, paginated).
     
-    # First page to confirm API is up
-    first_page = _fetch_page(url, {"closed": "false", "limit": 100, "offset": 0})
-    if not first_page:
-        return []
+    Pages are fetched in parallel, see fetch_geo_markets_fast. `limit` is
+    kept for backwards compatibility: pages are always PAGE_SIZE markets.
     
-    all_markets = list(first_page)
+    With use_cache, a list fetched less than config.MARKETS_CACHE_TTL
+    seconds ago (by any process) is reused from config.MARKETS_CACHE_FILE.
     
-    if len(first_page) < 100:
-        return all_markets
+    Raises MarketFetchError if a page cannot be fetched.
+    """
+    if use_cache:
+        markets = _load_markets_cache()
+        if markets is not None:
+            return markets
+    
+    markets = fetch_geo_markets_fast()
+    if use_cache and markets:
+        _save_markets_cache(markets)
+    return markets
+
+
+def _load_markets_cache() -> Optional[List[Dict]]:
+    """Cached market list if still fresh, else None."""
+    path = config.MARKETS_CACHE_FILE
+    try:
+        if time.time() - os.path.getmtime(path) >= config.MARKETS_CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            markets = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    _MARKET_INDEX.clear()
+    for m in markets:
+        mid = m.get("id")
+        if mid:
+            _MARKET_INDEX[str(mid)] = m
+    return markets
+
+
+def _save_markets_cache(markets: List[Dict]):
+    path = config.MARKETS_CACHE_FILE
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_json_dumpb(markets))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Could not save {path}: {e}")
+
+
+def fetch_geo_markets_fast(max_workers: int = FETCH_WORKERS) -> List[Dict]:
+    """Fetch all open markets with parallel pagination.
+    
+    ~10x faster than sequential paging. Workers share the pooled SESSION;
+    pages are returned in offset order.
     
-    # Generate all offsets (estimate ~28000 markets)
-    offsets = list(range(100, 30000, 100))
+    Pages are requested in waves of WAVE_SIZE offsets; the next wave is only
+    sent while every page of the current one came back full, so at most
+    one wave's worth of empty pages is ever requested.
+    
+    A page that still fails after PAGE_ATTEMPTS tries raises
+    MarketFetchError: a silently truncated list would look like the full
+    universe to callers.
+    """
+    url = f"{_GAMMA_URL}/markets"
+    
+    def fetch(offset: int) -> List[Dict]:
+        params = {"closed": "false", "limit": PAGE_SIZE, "offset": offset}
+        for attempt in range(PAGE_ATTEMPTS):
+            if attempt:
+                time.sleep(0.5 * 2 ** attempt)
+            page = _fetch_page(url, params, persist=True)
+            if page is not None:
+                return page
+        raise MarketFetchError(f"markets page at offset {offset} failed {PAGE_ATTEMPTS} times")
+    
+    all_markets = []
+    next_offset = 0
     
     with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        futures = {
-            pool.submit(_fetch_page, url, {"closed": "false", "limit": 100, "offset": o}): o
-            for o in offsets
-        }
-        
-        for future in as_completed(futures):
-            page = future.result()
-            if page:
+        while next_offset < MAX_OFFSET:
+            wave_end = min(next_offset + WAVE_SIZE * PAGE_SIZE, MAX_OFFSET)
+            pages = list(pool.map(fetch, range(next_offset, wave_end, PAGE_SIZE)))
+            
+            for page in pages:
                 all_markets.extend(page)
+            
+            # Only a page that really came back short ends the listing
+            if any(len(page) < PAGE_SIZE for page in pages):
+                break
+            next_offset = wave_end
+    
+    _MARKET_INDEX.clear()
+    for m in all_markets:
+        mid = m.get("id")
+        if mid:
+            _MARKET_INDEX[str(mid)] = m
     
     return all_markets
 
 
 def fetch_market_by_id(market_id: str) -> Optional[Dict]:
     """Fetch single market details."""
-    url = f"{config.GAMMA_API_URL}/markets/{market_id}"
+    url = f"{_GAMMA_URL}/markets/{market_id}"
     try:
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
+        return _conditional_get(url, timeout=15)
     except Exception as e:
         print(f"[ERROR] fetch_market_by_id({market_id}): {e}")
         return None
 
 
+def fetch_markets_by_ids(market_ids) -> Dict[str, Dict]:
+    """Fetch several markets at once, returning {market_id: market}.
+    
+    Markets from the last full fetch are served from memory; the rest are
+    requested in bulk (/markets?id=...&id=...), with a per-id fallback for
+    anything the bulk query did not return. Bulk chunks and fallbacks are
+    each fetched concurrently, so N missing markets cost ~one round trip.
+    """
+    found = {}
+    missing = []
+    for mid in market_ids:
+        m = _MARKET_INDEX.get(str(mid))
+        if m is not None:
+            found[mid] = m
+        else:
+            missing.append(mid)
+    
+    if not missing:
+        return found
+    
+    url = f"{_GAMMA_URL}/markets"
+    chunks = [missing[i:i + IDS_PER_REQUEST] for i in range(0, len(missing), IDS_PER_REQUEST)]
+    
+    def fetch_chunk(chunk: list) -> List[Dict]:
+        # A failed chunk falls through to the per-id fetches below
+        return _fetch_page(url, {"id": [str(mid) for mid in chunk], "limit": len(chunk)}) or []
+    
+    by_id = {}
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(chunks))) as pool:
+        for page in pool.map(fetch_chunk, chunks):
+            for m in page:
+                by_id[str(m.get("id"))] = m
+    for mid in missing:
+        if str(mid) in by_id:
+            found[mid] = by_id[str(mid)]
+    
+    leftover = [mid for mid in missing if mid not in found]
+    if leftover:
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(leftover))) as pool:
+            for mid, data in zip(leftover, pool.map(fetch_market_by_id, leftover)):
+                if data:
+                    found[mid] = data
+    
+    return found
+
+
 # =============================================================================
 # CLOB API (Trading)
 # =============================================================================
 
-def get_clob_headers(method: str, path: str, body: str = "") -> Dict[str, str]:
-    """Generate authenticated headers for CLOB API."""
-    timestamp = str(int(time.time()))
+_HMAC_PROTO = None  # HMAC keyed with the CLOB secret, built on first use
+
+
+def _hmac_proto():
+    """Return the keyed HMAC prototype; callers .copy() it per signature."""
+    global _HMAC_PROTO
+    if _HMAC_PROTO is None:
+        _HMAC_PROTO = hmac.new(_SECRET_BYTES, digestmod=hashlib.sha256)
+    return _HMAC_PROTO
+
+
+@lru_cache(maxsize=128)
+def _sign(method: str, path: str, body: bytes, timestamp: str) -> str:
+    """Base64 HMAC-SHA256 signature; repeats within the same second are free."""
+    h = _hmac_proto().copy()
+    h.update((timestamp + method + path).encode('utf-8'))
+    h.update(body)
+    return base64.b64encode(h.digest()).decode('utf-8')
+
+
+def get_clob_headers(method: str, path: str, body: Union[str, bytes] = b"") -> Dict[str, str]:
+    """Generate authenticated headers for CLOB API.
     
-    message = timestamp + method.upper() + path + body
-    signature = hmac.new(
-        base64.b64decode(config.POLYMARKET_SECRET),
-        message.encode('utf-8'),
-        hashlib.sha256
-    ).digest()
-    signature_b64 = base64.b64encode(signature).decode('utf-8')
+    body may be the serialized bytes that will be sent (preferred) or a str.
+    """
+    timestamp = str(int(time.time()))
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    signature_b64 = _sign(method.upper(), path, body, timestamp)
     
     return {
-        "POLY_API_KEY": config.POLYMARKET_API_KEY,
+        "POLY_API_KEY": _API_KEY,
         "POLY_SIGNATURE": signature_b64,
         "POLY_TIMESTAMP": timestamp,
-        "POLY_PASSPHRASE": config.POLYMARKET_PASSPHRASE,
+        "POLY_PASSPHRASE": _PASSPHRASE,
         "Content-Type": "application/json",
     }
 
 
 def get_orderbook(token_id: str) -> Optional[Dict]:
     """Get orderbook for a token."""
-    url = f"{config.CLOB_API_URL}/book"
+    url = f"{_CLOB_URL}/book"
     params = {"token_id": token_id}
     
     try:
-        resp = requests.get(url, params=params, timeout=15)
+        resp = SESSION.get(url, params=params, timeout=15)
         resp.raise_for_status()
-        return resp.json()
+        return _json_loads(resp.content)
     except Exception as e:
         print(f"[ERROR] get_orderbook({token_id}): {e}")
         return None
@@ -180,45 +420,81 @@ def get_best_price(token_id: str, side: str = "BUY") -> Optional[float]:
     return None
 
 
+# Account state only changes when we trade: keep it for a short TTL (with a
+# little jitter so callers don't all refresh on the same tick) and drop it
+# as soon as an order goes through.
+BALANCE_TTL = 60    # seconds
+POSITIONS_TTL = 30  # seconds
+_ACCOUNT_CACHE: Dict[str, Tuple[float, Any]] = {}  # key -> (expires_at, value)
+
+
+def _account_cache_get(key: str) -> Any:
+    entry = _ACCOUNT_CACHE.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _account_cache_put(key: str, value: Any, ttl: float):
+    _ACCOUNT_CACHE[key] = (time.monotonic() + ttl * random.uniform(0.8, 1.0), value)
+
+
+def invalidate_balance_cache():
+    """Forget cached balance/positions (call after anything that trades)."""
+    _ACCOUNT_CACHE.clear()
+
+
 def get_account_balance() -> Optional[float]:
-    """Get USDC balance from CLOB API."""
-    if not config.POLYMARKET_API_KEY:
+    """Get USDC balance from CLOB API (cached for BALANCE_TTL seconds)."""
+    if not _API_KEY:
         print("[WARN] No API key configured, returning mock balance")
         return config.BANKROLL
     
+    cached = _account_cache_get("balance")
+    if cached is not None:
+        return cached
+    
     path = "/balance"
     headers = get_clob_headers("GET", path)
     
     try:
-        resp = requests.get(
-            f"{config.CLOB_API_URL}{path}",
+        resp = SESSION.get(
+            f"{_CLOB_URL}{path}",
             headers=headers,
             timeout=15
         )
         resp.raise_for_status()
-        data = resp.json()
-        return float(data.get("balance", 0))
+        data = _json_loads(resp.content)
+        balance = float(data.get("balance", 0))
+        _account_cache_put("balance", balance, BALANCE_TTL)
+        return balance
     except Exception as e:
         print(f"[ERROR] get_account_balance: {e}")
         return None
 
 
 def get_open_positions() -> List[Dict]:
-    """Get current open positions."""
-    if not config.POLYMARKET_API_KEY:
+    """Get current open positions (cached for POSITIONS_TTL seconds)."""
+    if not _API_KEY:
         return []
     
+    cached = _account_cache_get("positions")
+    if cached is not None:
+        return cached
+    
     path = "/positions"
     headers = get_clob_headers("GET", path)
     
     try:
-        resp = requests.get(
-            f"{config.CLOB_API_URL}{path}",
+        resp = SESSION.get(
+            f"{_CLOB_URL}{path}",
             headers=headers,
             timeout=15
         )
         resp.raise_for_status()
-        return resp.json()
+        positions = _json_loads(resp.content)
+        _account_cache_put("positions", positions, POSITIONS_TTL)
+        return positions
     except Exception as e:
         print(f"[ERROR] get_open_positions: {e}")
         return []
@@ -245,7 +521,7 @@ def place_market_order(
         print(f"[DRY RUN] Would place {side} order for ${size:.2f} on {token_id}")
         return {"dry_run": True, "token_id": token_id, "side": side, "size": size}
     
-    if not config.POLYMARKET_API_KEY:
+    if not _API_KEY:
         print("[ERROR] Cannot place order: No API key configured")
         return None
     
@@ -257,19 +533,20 @@ def place_market_order(
         "type": "market",
     }
     
-    import json
-    body_str = json.dumps(body)
-    headers = get_clob_headers("POST", path, body_str)
+    # Serialize once: sign exactly the bytes we send
+    body_bytes = _json_dumpb(body)
+    headers = get_clob_headers("POST", path, body_bytes)
     
     try:
-        resp = requests.post(
-            f"{config.CLOB_API_URL}{path}",
+        resp = SESSION.post(
+            f"{_CLOB_URL}{path}",
             headers=headers,
-            json=body,
+            data=body_bytes,
             timeout=30
         )
         resp.raise_for_status()
-        return resp.json()
+        invalidate_balance_cache()
+        return _json_loads(resp.content)
     except Exception as e:
         print(f"[ERROR] place_market_order: {e}")
         return None
@@ -279,39 +556,41 @@ def place_market_order(
 # UTILITIES
 # =============================================================================
 
+def _json_list(val: Any) -> list:
+    """Decode a field that Gamma sends either as a JSON string or a list."""
+    if isinstance(val, (str, bytes)):
+        return _json_loads(val) if val else []
+    return val or []
+
+
+# Outcome label -> token slot; common casings hit without calling .lower()
+_OUTCOME_SLOT = {
+    "Yes": "YES", "yes": "YES", "YES": "YES",
+    "No": "NO", "no": "NO", "NO": "NO",
+}
+
+
 def get_token_ids(market: Dict) -> Dict[str, str]:
     """Extract YES and NO token IDs from market data."""
-    import json
     tokens = {}
     
-    # Try clobTokenIds first - may be JSON string
-    clob_ids_raw = market.get("clobTokenIds", [])
-    if isinstance(clob_ids_raw, str):
-        try:
-            clob_ids = json.loads(clob_ids_raw) if clob_ids_raw else []
-        except:
-            clob_ids = []
-    else:
-        clob_ids = clob_ids_raw or []
-    
-    # outcomes may also be JSON string
-    outcomes_raw = market.get("outcomes", [])
-    if isinstance(outcomes_raw, str):
-        try:
-            outcomes = json.loads(outcomes_raw) if outcomes_raw else []
-        except:
-            outcomes = []
-    else:
-        outcomes = outcomes_raw or []
+    # clobTokenIds and outcomes may both be JSON strings
+    try:
+        clob_ids = _json_list(market.get("clobTokenIds", []))
+    except (ValueError, TypeError):
+        clob_ids = []
+    try:
+        outcomes = _json_list(market.get("outcomes", []))
+    except (ValueError, TypeError):
+        outcomes = []
     
     if clob_ids and outcomes:
-        for i, outcome in enumerate(outcomes):
-            if i < len(clob_ids) and isinstance(outcome, str):
-                outcome_lower = outcome.lower()
-                if outcome_lower == "yes":
-                    tokens["YES"] = clob_ids[i]
-                elif outcome_lower == "no":
-                    tokens["NO"] = clob_ids[i]
+        for i, outcome in enumerate(outcomes[:len(clob_ids)]):
+            if not isinstance(outcome, str):
+                continue
+            slot = _OUTCOME_SLOT.get(outcome) or _OUTCOME_SLOT.get(outcome.lower())
+            if slot:
+                tokens[slot] = clob_ids[i]
     
     # Fallback for binary markets without Yes/No labels
     if not tokens and len(clob_ids) == 2:
@@ -321,6 +600,30 @@ def get_token_ids(market: Dict) -> Dict[str, str]:
     return tokens
 
 
+def parse_price_yes(market: Dict) -> Optional[float]:
+    """YES price (first outcomePrices entry), or None if missing/unparseable."""
+    try:
+        prices = _json_list(market.get("outcomePrices", ""))
+        return float(prices[0]) if prices else None
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+@lru_cache(maxsize=200_000)
+def _parse_ts_str(val: str) -> Optional[float]:
+    """Parse an ISO-8601 or unix-seconds string (cached: dates rarely change)."""
+    try:
+        # Try ISO format
+        return datetime.fromisoformat(val.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        pass
+    try:
+        # Try Unix timestamp string
+        return float(val)
+    except ValueError:
+        return None
+
+
 def parse_market_timestamps(market: Dict) -> Dict[str, Optional[float]]:
     """Parse market timestamps."""
     def parse_ts(key: str) -> Optional[float]:
@@ -330,17 +633,7 @@ def parse_market_timestamps(market: Dict) -> Dict[str, Optional[float]]:
         if isinstance(val, (int, float)):
             return float(val)
         if isinstance(val, str):
-            try:
-                # Try ISO format
-                dt = datetime.fromisoformat(val.replace('Z', '+00:00'))
-                return dt.timestamp()
-            except:
-                pass
-            try:
-                # Try Unix timestamp string
-                return float(val)
-            except:
-                pass
+            return _parse_ts_str(val)
         return None
     
     return {
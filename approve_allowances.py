@@ -1,9 +1,19 @@
 """Approve USDC allowances for Polymarket contracts on Polygon."""
 from web3 import Web3
+from requests.adapters import HTTPAdapter
 import os
 import time
+import requests
 
-w3 = Web3(Web3.HTTPProvider("https://polygon-bor-rpc.publicnode.com"))
+RPC_URL = "https://polygon-bor-rpc.publicnode.com"
+GAS_MARGIN = 1.5     # Headroom over each approve's estimate_gas
+POLL_LATENCY = 0.2   # Polygon blocks are ~2s; web3's default poll is 1s
+RECEIPT_TIMEOUT = 120
+
+# One keep-alive session for web3 and our raw batch calls
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+w3 = Web3(Web3.HTTPProvider(RPC_URL, session=session, request_kwargs={"timeout": 10}))
 pk = os.getenv("PRIVATE_KEY")
 acct = w3.eth.account.from_key(pk)
 print(f"Wallet: {acct.address}")
@@ -27,33 +37,90 @@ spenders = [
     "0xC5d563A36AE78145C45a50134d48A1215220f80a",
     "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296",
 ]
+spenders = [Web3.to_checksum_address(a) for a in spenders]
+
+
+def _estimate_approve(addr):
+    """estimate_gas for approve(addr), or None if it would fail/revert."""
+    try:
+        return contract.functions.approve(addr, approve_amt).estimate_gas({"from": acct.address})
+    except Exception as e:
+        print(f"  Gas estimation failed for {addr}: {e}")
+        return None
 
-for i, addr in enumerate(spenders):
-    checksum_addr = Web3.to_checksum_address(addr)
+
+def read_state(spender_addrs):
+    """[(allowance, approve gas estimate or None)] per spender.
     
-    # Check current allowance
-    current = contract.functions.allowance(acct.address, checksum_addr).call()
-    print(f"\n[{i+1}/3] {addr}")
+    Allowances and approve estimates go out in one JSON-RPC batch (ids 2i
+    and 2i+1); falls back to one call each if the batch fails.
+    """
+    batch = []
+    for i, addr in enumerate(spender_addrs):
+        batch.append({
+            "jsonrpc": "2.0",
+            "id": 2 * i,
+            "method": "eth_call",
+            "params": [{
+                "to": contract.address,
+                "data": contract.encode_abi("allowance", args=[acct.address, addr]),
+            }, "latest"],
+        })
+        batch.append({
+            "jsonrpc": "2.0",
+            "id": 2 * i + 1,
+            "method": "eth_estimateGas",
+            "params": [{
+                "from": acct.address,
+                "to": contract.address,
+                "data": contract.encode_abi("approve", args=[addr, approve_amt]),
+            }],
+        })
+    try:
+        resp = session.post(RPC_URL, json=batch, timeout=30)
+        resp.raise_for_status()
+        replies = {r["id"]: r for r in resp.json()}
+        state = []
+        for i, addr in enumerate(spender_addrs):
+            allowance = int(replies[2 * i]["result"], 16)
+            est = replies[2 * i + 1]
+            if "result" in est:
+                gas = int(est["result"], 16)
+            else:
+                # A revert comes back as a per-call error, not a failed batch
+                print(f"  Gas estimation failed for {addr}: {est.get('error')}")
+                gas = None
+            state.append((allowance, gas))
+        return state
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        print(f"Batch read failed ({e}), reading one by one")
+        return [
+            (contract.functions.allowance(acct.address, a).call(), _estimate_approve(a))
+            for a in spender_addrs
+        ]
+
+
+# ── 1. Current allowances + gas estimates (one round trip) ──────────────
+to_approve = []
+for i, (addr, (current, est_gas)) in enumerate(zip(spenders, read_state(spenders))):
+    print(f"\n[{i+1}/{len(spenders)}] {addr}")
     print(f"  Current allowance: {current}")
-    
     if current >= approve_amt:
         print("  Already approved, skipping")
         continue
-    
-    nonce = w3.eth.get_transaction_count(acct.address)
-    
-    # Estimate gas first
-    try:
-        est_gas = contract.functions.approve(checksum_addr, approve_amt).estimate_gas({"from": acct.address})
-        print(f"  Estimated gas: {est_gas}")
-        use_gas = int(est_gas * 1.5)
-    except Exception as e:
-        print(f"  Gas estimation failed: {e}")
+    if est_gas is None:
+        # Would revert: never broadcast it (it would also hold up later nonces)
         print("  Skipping this address")
         continue
-    
+    print(f"  Estimated gas: {est_gas}")
+    to_approve.append((addr, int(est_gas * GAS_MARGIN)))
+
+# ── 2. Send every approve back-to-back with consecutive nonces ──────────
+nonce = w3.eth.get_transaction_count(acct.address, "pending")
+hashes = []
+for addr, use_gas in to_approve:
     tx = contract.functions.approve(
-        checksum_addr, approve_amt
+        addr, approve_amt
     ).build_transaction({
         "from": acct.address,
         "nonce": nonce,
@@ -62,12 +129,51 @@ for i, addr in enumerate(spenders):
     })
     signed = acct.sign_transaction(tx)
     h = w3.eth.send_raw_transaction(signed.raw_transaction)
-    print(f"  Sent tx: {h.hex()}")
-    
-    receipt = w3.eth.wait_for_transaction_receipt(h, timeout=120)
-    print(f"  Status: {receipt.status} (1=success)")
+    print(f"  Sent tx for {addr} (nonce {nonce}): {h.hex()}")
+    hashes.append((addr, h))
+    nonce += 1
+
+# ── 3. Poll all receipts together (one batched request per tick) ───────
+def wait_for_receipts(tx_hashes):
+    """Return {tx_hash_hex: receipt} polling every POLL_LATENCY seconds.
     
-    if i < len(spenders) - 1:
-        time.sleep(5)
+    Hashes still pending at RECEIPT_TIMEOUT are missing from the result.
+    """
+    pending = {Web3.to_hex(h) for h in tx_hashes}
+    receipts = {}
+    deadline = time.monotonic() + RECEIPT_TIMEOUT
+    while pending and time.monotonic() < deadline:
+        order = sorted(pending)
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [h]}
+            for i, h in enumerate(order)
+        ]
+        try:
+            resp = session.post(RPC_URL, json=batch, timeout=10)
+            resp.raise_for_status()
+            replies = resp.json()
+            # An error envelope comes back as a single object: poll again
+            if not isinstance(replies, list):
+                raise ValueError(f"batch not answered: {str(replies)[:200]}")
+            for r in replies:
+                if isinstance(r, dict) and r.get("result"):
+                    h = order[r["id"]]
+                    receipts[h] = r["result"]
+                    pending.discard(h)
+        except (requests.RequestException, ValueError) as e:
+            print(f"  Receipt poll failed ({e}), retrying")
+        if pending:
+            time.sleep(POLL_LATENCY)
+    return receipts
+
+
+if hashes:
+    receipts = wait_for_receipts([h for _, h in hashes])
+    for addr, h in hashes:
+        receipt = receipts.get(Web3.to_hex(h))
+        if receipt is None:
+            print(f"  {addr}: no receipt after {RECEIPT_TIMEOUT}s")
+        else:
+            print(f"  {addr}: status {int(receipt['status'], 16)} (1=success)")
 
 print("\nDone!")
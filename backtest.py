@@ -19,16 +19,25 @@ Examples:
     python backtest.py simulate unlimited_wide
 """
 
+import os
 import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
-from snapshot import load_snapshot, list_snapshots, filter_snapshot_by_strategy, RunSnapshot
+from snapshot import list_snapshots, filter_snapshot_by_strategy, RunSnapshot
+from snapshot_cache import (
+    load_snapshot_cached as load_snapshot, snapshot_summary, load_result, store_result,
+    prune_cache, index_fields, update_index, save_index,
+)
 import strategies as strat_config
 
 
+# Snapshots are parsed + analyzed in worker processes above this count
+PARALLEL_MIN_SNAPSHOTS = 16
+
 # =============================================================================
 # BACKTEST STRUCTURES
 # =============================================================================
@@ -72,40 +81,43 @@ def analyze_snapshot_for_strategy(
     price_yes_max = strategy_params.get("price_yes_max", 1)
     min_volume = strategy_params.get("min_volume", 0)
     max_volume = strategy_params.get("max_volume", float("inf"))
+    cluster_filter = strategy_params.get("cluster_filter")
+    if cluster_filter:
+        cluster_filter = frozenset(cluster_filter)
+    # Get strategy name - support both formats
+    strategy_name = strategy_params.get("name", "Unknown")
     
-    # Filter markets by strategy params
+    # Filter markets by strategy params (cluster filter included)
     qualified = filter_snapshot_by_strategy(
         snapshot,
         price_yes_min=price_yes_min,
         price_yes_max=price_yes_max,
         min_volume=min_volume,
         max_volume=max_volume,
+        clusters=cluster_filter,
     )
     
-    # Apply cluster filter if present
-    cluster_filter = strategy_params.get("cluster_filter")
-    if cluster_filter:
-        qualified = [m for m in qualified if m.cluster in cluster_filter]
-    
-    # Calculate stats
-    if qualified:
-        prices = [m.price_yes for m in qualified]
-        volumes = [m.volume for m in qualified]
-        avg_price = sum(prices) / len(prices)
-        avg_volume = sum(volumes) / len(volumes)
-    else:
-        avg_price = 0
-        avg_volume = 0
-        prices = [0]
-        volumes = [0]
-    
-    # Cluster breakdown
+    # Calculate stats + cluster breakdown in a single pass
+    price_sum = volume_sum = 0.0
+    price_lo, price_hi = float("inf"), float("-inf")
     by_cluster = {}
     for m in qualified:
+        p = m.price_yes
+        price_sum += p
+        if p < price_lo:
+            price_lo = p
+        if p > price_hi:
+            price_hi = p
+        volume_sum += m.volume
         by_cluster[m.cluster] = by_cluster.get(m.cluster, 0) + 1
     
-    # Get strategy name - support both formats
-    strategy_name = strategy_params.get("name", "Unknown")
+    n = len(qualified)
+    if n:
+        avg_price = price_sum / n
+        avg_volume = volume_sum / n
+    else:
+        avg_price = avg_volume = 0
+        price_lo = price_hi = 0
     
     return BacktestResult(
         snapshot_id=snapshot.run_id,
@@ -114,10 +126,10 @@ def analyze_snapshot_for_strategy(
         total_eligible=len(snapshot.markets),
         strategy_qualified=len(qualified),
         avg_price_yes=avg_price,
-        min_price_yes=min(prices) if prices else 0,
-        max_price_yes=max(prices) if prices else 0,
+        min_price_yes=price_lo,
+        max_price_yes=price_hi,
         avg_volume=avg_volume,
-        total_volume=sum(volumes),
+        total_volume=volume_sum,
         by_cluster=by_cluster,
     )
 
@@ -154,16 +166,39 @@ def run_simulation(
     
     if snapshots is None:
         snapshots = list_snapshots()
+        # Full history: cache entries for anything else are dead weight
+        prune_cache(snapshots)
     
-    results = []
+    # Few snapshots: not worth spawning processes
+    if len(snapshots) < PARALLEL_MIN_SNAPSHOTS:
+        outputs = [_load_and_analyze(p, params) for p in snapshots]
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            outputs = list(ex.map(
+                _load_and_analyze, snapshots, [params] * len(snapshots), chunksize=8,
+            ))
     
-    for snap_path in snapshots:
-        snap = load_snapshot(snap_path)
-        if snap:
-            result = analyze_snapshot_for_strategy(snap, params)
-            results.append(result)
+    # Only this process writes the snapshot index, once per run
+    update_index(fields for _, fields in outputs)
+    return [r for r, _ in outputs if r is not None]
+
+
+def _load_and_analyze(snap_path: str, params: Dict) -> Tuple[Optional[BacktestResult], Optional[Tuple]]:
+    """Worker for run_simulation (module level so it can be pickled).
     
-    return results
+    Results are cached per (snapshot file, strategy params), so unchanged
+    snapshots are not even loaded on later runs. Returns the result plus
+    the index fields of a snapshot it had to load, for update_index().
+    """
+    result = load_result(snap_path, params)
+    if result is not None:
+        return result, None
+    snap = load_snapshot(snap_path)
+    if not snap:
+        return None, None
+    result = analyze_snapshot_for_strategy(snap, params)
+    store_result(snap_path, params, result)
+    return result, index_fields(snap_path, snap)
 
 
 # =============================================================================
@@ -243,9 +278,11 @@ def main():
         
         print(f"\nFound {len(snapshots)} snapshots:\n")
         for path in snapshots[-20:]:  # Last 20
-            snap = load_snapshot(path)
-            if snap:
-                print(f"  {snap.run_id}: {snap.geo_markets_found:>4} markets | {snap.timestamp[:16]}")
+            summary = snapshot_summary(path)
+            if summary:
+                run_id, timestamp, geo_found = summary
+                print(f"  {run_id}: {geo_found:>4} markets | {timestamp[:16]}")
+        save_index()
         
         if len(snapshots) > 20:
             print(f"\n  ... and {len(snapshots) - 20} older snapshots")
@@ -10,44 +10,50 @@ Usage:
     python bot.py --paper all          # ALL 24 strategies
     python bot.py --paper tier1        # Tier 1 controls only
     python bot.py --paper balanced     # Single strategy
+    python bot.py --paper --no-cache   # Ignore markets fetched < 60s ago
     python bot.py --sell "iran"        # Manually sell matching positions
     python bot.py --strategies         # Show available strategies
 """
 
 import sys
-import json
 import os
-import requests
-from datetime import datetime
+import time
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 
-import config
-import api
+# config / api (requests, urllib3, ...) and concurrent.futures are imported
+# inside the functions that need them, so --help, --strategies and --sell
+# start fast.
 
-# Import geopolitical filters
-try:
-    from trade_filter import is_geopolitical, get_cluster, classify
-except ImportError:
+# The geopolitical filters compile their keyword tables on import: load
+# them on first use, so --help, --strategies and --sell start fast
+def _geo_filters():
     try:
-        from filters import is_geopolitical, get_cluster
+        from trade_filter import is_geopolitical, get_cluster
     except ImportError:
-        # Minimal fallback
-        def is_geopolitical(q):
-            kw = ["strike", "attack", "war", "invasion", "bomb", "missile",
-                   "ceasefire", "sanctions", "troops", "nuclear", "military"]
-            q_l = q.lower()
-            return any(k in q_l for k in kw)
-        def get_cluster(q):
-            q_l = q.lower()
-            if any(k in q_l for k in ["ukraine", "russia", "kyiv", "crimea", "kursk"]):
-                return "ukraine"
-            if any(k in q_l for k in ["israel", "gaza", "iran", "hamas", "hezbollah", "yemen", "houthi"]):
-                return "mideast"
-            if any(k in q_l for k in ["china", "taiwan", "beijing"]):
-                return "china"
-            return "other"
+        try:
+            from filters import is_geopolitical, get_cluster
+        except ImportError:
+            # Minimal fallback
+            def is_geopolitical(q):
+                kw = ["strike", "attack", "war", "invasion", "bomb", "missile",
+                       "ceasefire", "sanctions", "troops", "nuclear", "military"]
+                q_l = q.lower()
+                return any(k in q_l for k in kw)
+            def get_cluster(q):
+                q_l = q.lower()
+                if any(k in q_l for k in ["ukraine", "russia", "kyiv", "crimea", "kursk"]):
+                    return "ukraine"
+                if any(k in q_l for k in ["israel", "gaza", "iran", "hamas", "hezbollah", "yemen", "houthi"]):
+                    return "mideast"
+                if any(k in q_l for k in ["china", "taiwan", "beijing"]):
+                    return "china"
+                return "other"
+
+    return is_geopolitical, get_cluster
 
 
 # =============================================================================
@@ -55,18 +61,43 @@ except ImportError:
 # =============================================================================
 
 def log(msg: str, level: str = "INFO"):
-    ts = datetime.now().strftime("%H:%M:%S")
+    ts = time.strftime("%H:%M:%S")  # C-level, no datetime object per line
     print(f"[{ts}] [{level}] {msg}")
 
 
-def send_telegram(message: str):
-    """Send Telegram notification (best-effort)."""
-    token = os.getenv("TELEGRAM_BOT_TOKEN", "")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID", "")
-    if not token or not chat_id:
-        return
+# Keep-alive session: one TLS handshake per process for all notifications.
+# Built on first send, so runs that never notify don't import requests.
+_TG_SESSION = None
+_TG_BUFFER: List[str] = []
+
+
+def _telegram_session():
+    global _TG_SESSION
+    if _TG_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        # Retries cover connection errors only (POST is never re-sent after a reply)
+        session.mount("https://", HTTPAdapter(
+            pool_connections=2, pool_maxsize=2,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ))
+        _TG_SESSION = session
+    return _TG_SESSION
+
+
+# Sends run on one daemon thread so the bot never waits on Telegram;
+# drain_telegram() gives pending messages a bounded time at exit.
+TELEGRAM_DRAIN_TIMEOUT = 15  # seconds
+_TG_QUEUE = None
+_TG_THREAD = None
+
+
+def _post_telegram(token: str, chat_id: str, message: str):
     try:
-        requests.post(
+        _telegram_session().post(
             f"https://api.telegram.org/bot{token}/sendMessage",
             json={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
             timeout=10,
@@ -75,6 +106,80 @@ def send_telegram(message: str):
         pass
 
 
+def _telegram_worker(q):
+    while True:
+        item = q.get()
+        if item is None:
+            return
+        _post_telegram(*item)
+
+
+def send_telegram(message: str):
+    """Queue a Telegram notification (best-effort, returns immediately)."""
+    global _TG_QUEUE, _TG_THREAD
+    token = os.getenv("TELEGRAM_BOT_TOKEN", "")
+    chat_id = os.getenv("TELEGRAM_CHAT_ID", "")
+    if not token or not chat_id:
+        return
+    if _TG_THREAD is None:
+        import queue
+        import threading
+        _TG_QUEUE = queue.SimpleQueue()
+        _TG_THREAD = threading.Thread(target=_telegram_worker, args=(_TG_QUEUE,),
+                                      name="telegram", daemon=True)
+        _TG_THREAD.start()
+    _TG_QUEUE.put((token, chat_id, message))
+
+
+def drain_telegram(timeout: float = TELEGRAM_DRAIN_TIMEOUT):
+    """Wait (at most `timeout` seconds) for queued notifications to go out."""
+    global _TG_QUEUE, _TG_THREAD
+    if _TG_THREAD is None:
+        return
+    _TG_QUEUE.put(None)
+    _TG_THREAD.join(timeout)
+    _TG_QUEUE = _TG_THREAD = None
+
+
+TELEGRAM_MAX_CHARS = 4000  # sendMessage caps at 4096; keep headroom for HTML
+
+
+def send_telegram_digest(lines: List[str]):
+    """Send many lines as few Telegram messages as possible.
+    
+    Lines are packed into messages of at most TELEGRAM_MAX_CHARS, so a
+    full run summary is usually a single API call.
+    """
+    chunk, size = [], 0
+    for line in lines:
+        if chunk and size + len(line) + 1 > TELEGRAM_MAX_CHARS:
+            send_telegram("\n".join(chunk))
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line) + 1
+    if chunk:
+        send_telegram("\n".join(chunk))
+
+
+def queue_telegram(*lines: str):
+    """Buffer notification lines; they go out together on flush_telegram()."""
+    _TG_BUFFER.extend(lines)
+
+
+def flush_telegram():
+    """Send everything queued so far as one digest."""
+    if _TG_BUFFER:
+        lines = list(_TG_BUFFER)
+        _TG_BUFFER.clear()
+        send_telegram_digest(lines)
+
+
+@lru_cache(maxsize=4096)
+def _close_date(end_ts: int) -> str:
+    """Local YYYY-MM-DD for an end timestamp (many markets share end dates)."""
+    return time.strftime("%Y-%m-%d", time.localtime(end_ts))
+
+
 # =============================================================================
 # ENRICHED CANDIDATE (pre-computed once, shared across strategies)
 # =============================================================================
@@ -97,23 +202,39 @@ class EnrichedMarket:
     raw: dict              # Original market data (for resolution checking)
 
 
+def classify_questions(questions: List[str]) -> List[Optional[str]]:
+    """Cluster for each geopolitical question, None for the rest."""
+    is_geopolitical, get_cluster = _geo_filters()
+    return [get_cluster(q) if is_geopolitical(q) else None for q in questions]
+
+
 def precompute_candidates(markets: list, current_ts: float) -> List[EnrichedMarket]:
     """Evaluate ALL markets once → list of geopolitical candidates.
     
     This is the expensive step (keyword matching, parsing, validation).
     Done ONCE, then each strategy just filters numerically.
     """
-    candidates = []
+    import config
+    import api
     
-    for market in markets:
-        question = market.get("question", "")
-        
-        # 1) Geopolitical filter (the expensive check)
-        if not is_geopolitical(question):
+    candidates = []
+    append = candidates.append
+    buffer_hours = getattr(config, "BUFFER_HOURS", 48)
+    # Bound once: the loop below runs for every geopolitical market
+    parse_timestamps = api.parse_market_timestamps
+    parse_price_yes = api.parse_price_yes
+    get_token_ids = api.get_token_ids
+    
+    # 1) Geopolitical filter + cluster (the expensive check), all at once
+    questions = [market.get("question", "") for market in markets]
+    clusters = classify_questions(questions)
+    
+    for market, question, cluster in zip(markets, questions, clusters):
+        if cluster is None:
             continue
         
         # 2) Parse timestamps
-        timestamps = api.parse_market_timestamps(market)
+        timestamps = parse_timestamps(market)
         start_ts = timestamps.get("start_ts")
         end_ts = timestamps.get("end_ts")
         
@@ -125,21 +246,11 @@ def precompute_candidates(markets: list, current_ts: float) -> List[EnrichedMark
         hours_until_end = (end_ts - current_ts) / 3600
         
         # Skip if too new or about to close
-        buffer_hours = getattr(config, "BUFFER_HOURS", 48)
         if hours_since_open < buffer_hours or hours_until_end < buffer_hours:
             continue
         
         # 4) Parse price
-        try:
-            prices_raw = market.get("outcomePrices", "")
-            if isinstance(prices_raw, str) and prices_raw:
-                prices = json.loads(prices_raw)
-            else:
-                prices = prices_raw or []
-            price_yes = float(prices[0]) if prices else None
-        except (json.JSONDecodeError, IndexError, ValueError):
-            continue
-        
+        price_yes = parse_price_yes(market)
         if price_yes is None or price_yes <= 0 or price_yes >= 1:
             continue
         
@@ -147,26 +258,26 @@ def precompute_candidates(markets: list, current_ts: float) -> List[EnrichedMark
         volume = float(market.get("volume", 0) or 0)
         
         # 6) Token IDs
-        tokens = api.get_token_ids(market)
+        tokens = get_token_ids(market)
         token_yes = tokens.get("YES", "")
         token_no = tokens.get("NO", "")
         
-        # 7) Metadata
+        # 7) Metadata (each raw field read once; strategies then only touch
+        # EnrichedMarket attributes)
         days_to_close = hours_until_end / 24
-        event_id = market.get("groupItemTitle", "") or market.get("slug", "")
+        group_title = market.get("groupItemTitle")
+        event_id = group_title or market.get("slug", "")
         
         # Detect series structure (for exclude_series filter)
         # Series markets typically share an event/group
-        structure = ""
-        if market.get("groupItemTitle"):
-            structure = "series"
+        structure = "series" if group_title else ""
         
-        candidates.append(EnrichedMarket(
-            market_id=market.get("id", market.get("conditionId", "")),
+        append(EnrichedMarket(
+            market_id=market["id"] if "id" in market else market.get("conditionId", ""),
             question=question[:120],
             price_yes=price_yes,
             volume=volume,
-            cluster=get_cluster(question),
+            cluster=cluster,
             days_to_close=days_to_close,
             end_ts=end_ts,
             start_ts=start_ts,
@@ -191,9 +302,9 @@ def filter_for_strategy(
     """Filter pre-computed candidates for a specific strategy.
     
     This is FAST — no keyword matching, no API calls, just comparisons.
+    Price zones are resolved once per strategy into plain tuples, so the
+    per-candidate loop never touches the strategy dict.
     """
-    from strategies import get_zone_for_volume
-    
     filtered = []
     
     # Strategy params
@@ -201,17 +312,27 @@ def filter_for_strategy(
     max_vol = strat.get("max_volume", float("inf"))
     deadline_min = strat.get("deadline_min", 3)
     deadline_max = strat.get("deadline_max", None)
+    if deadline_max is None:
+        deadline_max = float("inf")
     exclude_series = strat.get("exclude_series", False)
     
+    # Price zones as (vol_min, vol_max, price_min, price_max) — same rules
+    # as strategies.get_zone_for_volume (first matching bucket wins)
+    zones = strat.get("zones")
+    if zones:
+        zone_table = [
+            (z.get("vol_min", 0), z.get("vol_max", float("inf")),
+             z["price_yes_min"], z["price_yes_max"])
+            for z in zones
+        ]
+    else:
+        zone_table = None
+        price_min, price_max = strat["price_yes_min"], strat["price_yes_max"]
+    
     for c in candidates:
-        # Volume filter
-        if c.volume < min_vol or c.volume > max_vol:
-            continue
-        
-        # Deadline filter
-        if c.days_to_close < deadline_min:
-            continue
-        if deadline_max is not None and c.days_to_close > deadline_max:
+        vol = c.volume
+        # Volume + deadline filters
+        if not (min_vol <= vol <= max_vol and deadline_min <= c.days_to_close <= deadline_max):
             continue
         
         # Exclude series
@@ -219,29 +340,34 @@ def filter_for_strategy(
             continue
         
         # Price zone (simple or multi-bucket)
-        zone = get_zone_for_volume(strat, c.volume)
-        if zone is None:
-            # Dead zone — skip
-            continue
-        
-        price_min, price_max = zone
-        if not (price_min <= c.price_yes <= price_max):
+        if zone_table is None:
+            if price_min <= c.price_yes <= price_max:
+                filtered.append(c)
             continue
         
-        filtered.append(c)
+        for vol_min, vol_max, zmin, zmax in zone_table:
+            if vol_min <= vol < vol_max:
+                if zmin <= c.price_yes <= zmax:
+                    filtered.append(c)
+                break
+        # No matching bucket = dead zone — skip
     
     return filtered
 
 
 def sort_candidates(candidates: List[EnrichedMarket], priority: str) -> List[EnrichedMarket]:
-    """Sort candidates by strategy priority."""
+    """Sort candidates by strategy priority.
+    
+    Sorts are stable, so sorting the shared pool once and then filtering
+    gives the same order as filtering first and sorting each subset.
+    """
     if priority == "price_high":
         # Higher YES price first (more edge for NO bets)
-        return sorted(candidates, key=lambda c: c.price_yes, reverse=True)
+        return sorted(candidates, key=attrgetter("price_yes"), reverse=True)
     
     elif priority == "volume_low":
         # Lower volume first (more inefficient markets)
-        return sorted(candidates, key=lambda c: c.volume)
+        return sorted(candidates, key=attrgetter("volume"))
     
     elif priority == "rotation":
         # Composite: rank by volume_low + deadline_short + price_high
@@ -271,8 +397,12 @@ def select_trades(
     existing_market_ids: Set[str],
     existing_event_counts: Dict[str, int],
     bankroll: float,
+    presorted: bool = False,
 ) -> List[Tuple[EnrichedMarket, float]]:
-    """Select trades with new features. Returns list of (candidate, bet_size)."""
+    """Select trades with new features. Returns list of (candidate, bet_size).
+    
+    presorted=True: candidates are already in sort_candidates() order.
+    """
     from strategies import get_bet_size
     
     max_total = bankroll * strat.get("max_total_exposure_pct", 0.90)
@@ -280,7 +410,10 @@ def select_trades(
     event_cap = strat.get("event_cap", 3)
     
     # Sort by priority
-    sorted_cands = sort_candidates(candidates, strat.get("priority", "price_high"))
+    if presorted:
+        sorted_cands = candidates
+    else:
+        sorted_cands = sort_candidates(candidates, strat.get("priority", "price_high"))
     
     selected = []
     sim_exposure = current_exposure
@@ -336,29 +469,31 @@ def batch_fetch_closed_markets(
     
     Returns dict of market_id -> market_data for resolved markets.
     """
-    resolved = {}
-    for mid in missing_ids:
-        if mid in market_lookup:
-            continue  # Already have it
-        try:
-            data = api.fetch_market_by_id(mid)
-            if data:
-                resolved[mid] = data
-        except Exception:
-            pass
-    return resolved
+    import api
+    
+    to_fetch = [mid for mid in missing_ids if mid not in market_lookup]
+    try:
+        return api.fetch_markets_by_ids(to_fetch)
+    except Exception:
+        return {}
 
 
 # =============================================================================
 # PAPER TRADING MAIN LOOP
 # =============================================================================
 
-def run_paper_trading(strategy_name: str = None):
-    """Run paper trading — optimized for many strategies."""
+def run_paper_trading(strategy_name: str = None, use_cache: bool = True):
+    """Run paper trading — optimized for many strategies.
+    
+    use_cache=False (--no-cache) always refetches markets from Gamma.
+    """
+    import config
+    import api
     import paper_trading as pt
     import strategies as strat_config
+    from concurrent.futures import ThreadPoolExecutor
     
-    run_start = datetime.now()
+    run_start = time.time()
     log("=" * 60)
     log("POLYMARKET BOT — PAPER TRADING")
     log("=" * 60)
@@ -382,30 +517,25 @@ def run_paper_trading(strategy_name: str = None):
     
     # ── Step 1: Fetch markets ONCE ───────────────────────────────────────
     log("\nFetching markets...")
-    t0 = datetime.now()
-    markets = api.fetch_open_markets(limit=5000)
-    log(f"Fetched {len(markets)} markets in {(datetime.now()-t0).total_seconds():.1f}s")
+    t0 = time.time()
+    try:
+        markets = api.fetch_open_markets(limit=5000, use_cache=use_cache)
+    except api.MarketFetchError as e:
+        # A partial list would look like the full universe: trade nothing
+        log(f"Market fetch failed, aborting run: {e}", "ERROR")
+        queue_telegram(f"⚠️ <b>Paper Trading</b> aborted: {e}")
+        return
+    log(f"Fetched {len(markets)} markets in {time.time()-t0:.1f}s")
     
-    market_lookup = {}
-    for m in markets:
-        mid = m.get("id") or m.get("conditionId")
-        if mid:
-            market_lookup[mid] = m
+    market_lookup = {
+        mid: m for m in markets
+        if (mid := m.get("id") or m.get("conditionId"))
+    }
     
     # ── Step 2: Pre-compute geopolitical candidates ONCE ─────────────────
-    current_ts = datetime.now().timestamp()
-    t0 = datetime.now()
+    current_ts = t0 = time.time()
     all_candidates = precompute_candidates(markets, current_ts)
-    log(f"Pre-computed {len(all_candidates)} geopolitical candidates in {(datetime.now()-t0).total_seconds():.1f}s")
-    
-    # ── LLM validation ───────────────────────────────────────────────────
-    try:
-        from llm_filter import llm_validate_candidates
-        all_candidates, rejected = llm_validate_candidates(all_candidates)
-        if rejected:
-            log(f"LLM rejected {len(rejected)} markets, {len(all_candidates)} remaining")
-    except Exception as e:
-        log(f"LLM filter skipped: {e}", "WARN")
+    log(f"Pre-computed {len(all_candidates)} geopolitical candidates in {time.time()-t0:.1f}s")
     
     # ── Step 3: Collect ALL open position market IDs (for batch resolution) ──
     all_open_mids: Set[str] = set()
@@ -422,80 +552,111 @@ def run_paper_trading(strategy_name: str = None):
         )
         portfolios[strat_name] = (portfolio, portfolio_file)
         
-        for pos in portfolio.positions:
+        for pos in portfolio.open_positions:
             if pos.status == "open":
                 all_open_mids.add(pos.market_id)
     
     # ── Step 4: Batch-fetch closed markets ───────────────────────────────
+    # Network-bound: runs in the background while the LLM validation (also
+    # network-bound) runs below; market_lookup is only read until joined.
     missing_mids = all_open_mids - set(market_lookup.keys())
+    closed_future = None
     if missing_mids:
         log(f"Fetching {len(missing_mids)} closed markets for resolution...")
-        t0 = datetime.now()
-        closed_data = batch_fetch_closed_markets(missing_mids, market_lookup)
+        t0 = time.time()
+        closed_pool = ThreadPoolExecutor(max_workers=1)
+        closed_future = closed_pool.submit(batch_fetch_closed_markets, missing_mids, market_lookup)
+        closed_pool.shutdown(wait=False)
+    
+    # ── LLM validation ───────────────────────────────────────────────────
+    try:
+        from llm_filter import llm_validate_candidates
+        all_candidates, rejected = llm_validate_candidates(all_candidates)
+        if rejected:
+            log(f"LLM rejected {len(rejected)} markets, {len(all_candidates)} remaining")
+    except Exception as e:
+        log(f"LLM filter skipped: {e}", "WARN")
+    
+    if closed_future is not None:
+        closed_data = closed_future.result()
         market_lookup.update(closed_data)
-        log(f"Fetched {len(closed_data)} closed markets in {(datetime.now()-t0).total_seconds():.1f}s")
+        log(f"Fetched {len(closed_data)} closed markets in {time.time()-t0:.1f}s")
     
     # ── Step 5: Process each strategy ────────────────────────────────────
     summary_lines = [
         f"📊 <b>Paper Trading</b> ({len(strategies)} strategies)",
-        f"{datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"{time.strftime('%Y-%m-%d %H:%M')}",
         "",
     ]
     
+    # Many strategies hold the same markets: parse prices / resolution
+    # once per market and share the result across strategies. Candidates
+    # already carry the price parsed during pre-compute.
+    price_yes_by_mid: Dict[str, Optional[float]] = {
+        c.market_id: c.price_yes for c in all_candidates if c.market_id
+    }
+    # Every position checked below is in all_open_mids, so resolve those
+    # markets once up front; only resolved ones are kept.
+    outcome_by_mid: Dict[str, str] = {
+        mid: outcome for mid in all_open_mids & market_lookup.keys()
+        if (outcome := pt.check_resolution(market_lookup[mid]))
+    }
+    
+    def market_price_yes(mid: str) -> Optional[float]:
+        if mid not in price_yes_by_mid:
+            mdata = market_lookup.get(mid)
+            price_yes_by_mid[mid] = api.parse_price_yes(mdata) if mdata else None
+        return price_yes_by_mid[mid]
+    
+    writer = pt.PortfolioWriter()
+    ranked_pools: Dict[str, List[EnrichedMarket]] = {}
+    
     for strat_name, strat_params in strategies.items():
         portfolio, portfolio_file = portfolios[strat_name]
         
-        # ── 5a. Update prices for open positions ─────────────────────────
-        for pos in portfolio.positions:
-            if pos.status != "open":
-                continue
-            mdata = market_lookup.get(pos.market_id)
-            if mdata:
-                try:
-                    prices_raw = mdata.get("outcomePrices", "")
-                    if isinstance(prices_raw, str) and prices_raw:
-                        prices = json.loads(prices_raw)
-                    else:
-                        prices = prices_raw or []
-                    if prices:
-                        price_yes = float(prices[0])
-                        pos.price_yes_current = price_yes
-                        pos.current_price = 1 - price_yes if pos.bet_side == "NO" else price_yes
-                except Exception:
-                    pass
-        
-        # ── 5b. Check resolutions ───────────────────────────────────────
+        open_positions = [p for p in portfolio.open_positions if p.status == "open"]
+        
+        # ── 5a/5b. Update prices + check resolutions (one pass) ──────────
         resolved_count = 0
-        for pos in list(portfolio.positions):
-            if pos.status != "open":
-                continue
-            mdata = market_lookup.get(pos.market_id)
-            if mdata:
-                outcome = pt.check_resolution(mdata)
-                if outcome:
-                    pnl = pt.settle_position(pos, outcome)
-                    portfolio.closed_trades.append(pos)
-                    resolved_count += 1
-                    emoji = "✅" if pos.resolution == "win" else "❌"
-                    log(f"  {emoji} {pos.bet_side} resolved: {outcome.upper()} | P&L: ${pnl:+.2f}")
+        for pos in open_positions:
+            price_yes = market_price_yes(pos.market_id)
+            if price_yes is not None:
+                pos.price_yes_current = price_yes
+                pos.current_price = 1 - price_yes if pos.bet_side == "NO" else price_yes
+            
+            outcome = outcome_by_mid.get(pos.market_id)
+            if outcome:
+                pnl = pt.settle_position(pos, outcome)
+                portfolio.closed_trades.append(pos)
+                resolved_count += 1
+                emoji = "✅" if pos.resolution == "win" else "❌"
+                log(f"  {emoji} {pos.bet_side} resolved: {outcome.upper()} | P&L: ${pnl:+.2f}")
         
         if resolved_count > 0:
             pt.update_portfolio_stats(portfolio)
+            open_positions = [p for p in open_positions if p.status == "open"]
         
         # ── 5c. Filter candidates for this strategy ──────────────────────
-        strat_candidates = filter_for_strategy(all_candidates, strat_params)
-        
-        # ── 5d. Calculate exposure ───────────────────────────────────────
-        exposure_total, exposure_by_cluster = pt.get_open_exposure(portfolio)
-        existing_ids = {p.market_id for p in portfolio.positions if p.status == "open"}
-        cash_available = portfolio.bankroll_current - exposure_total
-        
-        # Count positions per event_id
+        # The pool is ranked once per priority; filtering keeps that order
+        priority = strat_params.get("priority", "price_high")
+        if priority not in ranked_pools:
+            ranked_pools[priority] = sort_candidates(all_candidates, priority)
+        strat_candidates = filter_for_strategy(ranked_pools[priority], strat_params)
+        
+        # ── 5d. Exposure, open market ids, positions per event_id ────────
+        # One pass over open_positions (same sums as pt.get_open_exposure)
+        exposure_total = 0.0
+        exposure_by_cluster: Dict[str, float] = {}
+        existing_ids = set()
         event_counts: Dict[str, int] = {}
-        for pos in portfolio.positions:
-            if pos.status == "open":
-                eid = getattr(pos, "event_id", "") or ""
-                event_counts[eid] = event_counts.get(eid, 0) + 1
+        for pos in open_positions:
+            size = pos.size_usd
+            exposure_total += size
+            exposure_by_cluster[pos.cluster] = exposure_by_cluster.get(pos.cluster, 0) + size
+            existing_ids.add(pos.market_id)
+            eid = getattr(pos, "event_id", "") or ""
+            event_counts[eid] = event_counts.get(eid, 0) + 1
+        cash_available = portfolio.bankroll_current - exposure_total
         
         # ── 5e. Select trades ────────────────────────────────────────────
         selected = select_trades(
@@ -504,14 +665,16 @@ def run_paper_trading(strategy_name: str = None):
             cash_available=cash_available,
             current_exposure=exposure_total,
             exposure_by_cluster=exposure_by_cluster,
-            existing_market_ids=set(existing_ids),  # copy
+            existing_market_ids=existing_ids,  # not reused after this
             existing_event_counts=event_counts,
             bankroll=portfolio.bankroll_current,
+            presorted=True,
         )
         
         # ── 5f. Execute paper trades ──────────────────────────────────────
+        bet_side = strat_params.get("bet_side", "NO")
+        bought = 0
         for candidate, bet_size in selected:
-            bet_side = strat_params.get("bet_side", "NO")
             if bet_side == "NO":
                 token_id = candidate.token_id_no
                 entry_price = 1 - candidate.price_yes
@@ -519,9 +682,9 @@ def run_paper_trading(strategy_name: str = None):
                 token_id = candidate.token_id_yes
                 entry_price = candidate.price_yes
             
-            expected_close = datetime.fromtimestamp(candidate.end_ts).strftime("%Y-%m-%d")
+            expected_close = _close_date(int(candidate.end_ts))
             
-            pt.paper_buy(
+            position = pt.paper_buy(
                 portfolio=portfolio,
                 market_id=candidate.market_id,
                 question=candidate.question,
@@ -532,32 +695,36 @@ def run_paper_trading(strategy_name: str = None):
                 cluster=candidate.cluster,
                 expected_close=expected_close,
             )
+            if position:
+                bought += 1
         
-        # ── 5g. Save portfolio ───────────────────────────────────────────
-        pt.save_portfolio(portfolio, portfolio_file)
+        # ── 5g. Save portfolio (written in the background) ───────────────
+        writer.submit(portfolio, portfolio_file)
         
         # ── 5h. Summary line ─────────────────────────────────────────────
-        open_count = len([p for p in portfolio.positions if p.status == "open"])
+        open_count = len(open_positions) + bought
         summary_lines.append(
             f"<b>{strat_name}</b>: ${portfolio.total_pnl:+.2f} "
             f"({portfolio.wins}W/{portfolio.losses}L) | "
             f"{open_count} open | +{len(selected)} new | {resolved_count} resolved"
         )
     
+    # Portfolios must be on disk before we report the run
+    writer.close()
+    
     # ── Step 6: Notifications ────────────────────────────────────────────
-    duration = (datetime.now() - run_start).total_seconds()
+    duration = time.time() - run_start
     summary_lines.append(f"\n⏱ {duration:.0f}s | {len(all_candidates)} geo candidates")
     
-    # Only send full summary if ≤ 8 strategies, otherwise compact
+    # Full per-strategy digest only if ≤ 8 strategies, otherwise compact
     if len(strategies) <= 8:
-        send_telegram("\n".join(summary_lines))
+        queue_telegram(*summary_lines)
     else:
-        # Compact: just totals
-        total_new = sum(1 for s in strategies for _ in [])  # placeholder
-        send_telegram(
+        queue_telegram(
             f"📊 Paper trading: {len(strategies)} strategies updated in {duration:.0f}s\n"
             f"Candidates pool: {len(all_candidates)} geo markets"
         )
+    flush_telegram()
     
     log(f"\n{'='*60}")
     log(f"COMPLETE in {duration:.1f}s ({len(strategies)} strategies, {len(all_candidates)} candidates)")
@@ -572,23 +739,48 @@ def manual_sell(search_term: str):
     """Manually sell positions matching a search term across all strategies."""
     import paper_trading as pt
     import strategies as strat_config
-    
-    count = 0
+    from concurrent.futures import ThreadPoolExecutor
+    
+    needle = search_term.lower()
+    # Plain-ASCII terms can be checked against the raw file bytes first
+    # (JSON only escapes quotes, backslashes and non-ASCII), which skips
+    # parsing every portfolio that has no matching question at all.
+    raw_needle = needle.encode() if needle.isascii() and not set(needle) & set('"\\') else None
+    
+    # One directory listing instead of an exists() check per strategy
+    # (portfolio files live at repo root); each file is handled once.
+    existing = {e.name for e in os.scandir(".") if e.is_file()}
+    targets = {}
     for strat_name, strat_params in strat_config.STRATEGIES.items():
         portfolio_file = strat_params.get("portfolio_file", f"portfolio_{strat_name}.json")
-        
-        if not Path(portfolio_file).exists():
-            continue
-        
-        portfolio = pt.load_portfolio(
+        if portfolio_file in existing or (os.sep in portfolio_file and Path(portfolio_file).exists()):
+            targets.setdefault(portfolio_file, (strat_name, strat_params))
+    
+    def load(portfolio_file: str):
+        strat_name, strat_params = targets[portfolio_file]
+        if raw_needle is not None:
+            with open(portfolio_file, "rb") as f:
+                if raw_needle not in f.read().lower():
+                    return None
+        return pt.load_portfolio(
             portfolio_file=portfolio_file,
             initial_bankroll=strat_params.get("bankroll", 1000),
             entry_cost_rate=strat_params.get("entry_cost_rate", 0.03),
         )
+    
+    # Independent file reads: load them concurrently, then sell in order
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        loaded = list(pool.map(load, targets))
+    
+    count = 0
+    for portfolio_file, portfolio in zip(targets, loaded):
+        if portfolio is None:
+            continue
+        strat_name = targets[portfolio_file][0]
         
         sold = False
-        for pos in portfolio.positions:
-            if pos.status == "open" and search_term.lower() in pos.question.lower():
+        for pos in portfolio.open_positions:
+            if pos.status == "open" and needle in pos.question.lower():
                 pos.status = "sold"
                 pos.pnl = 0  # Manual sell at current price (simplified)
                 sold = True
@@ -606,30 +798,55 @@ def manual_sell(search_term: str):
 # =============================================================================
 
 def main():
-    args = sys.argv[1:]
-    
-    if not args or "--help" in args:
-        print(__doc__)
-        return
-    
-    if "--strategies" in args:
-        import strategies as strat_config
-        strat_config.print_strategies()
-        return
-    
-    if "--sell" in args:
-        idx = args.index("--sell")
-        if idx + 1 < len(args):
-            manual_sell(args[idx + 1])
-        else:
-            print("Usage: python bot.py --sell <search_term>")
-        return
+    try:
+        _main(sys.argv[1:])
+    finally:
+        flush_telegram()
+        drain_telegram()
+
+
+def _cmd_help(args: List[str]):
+    print(__doc__)
+
+
+def _cmd_strategies(args: List[str]):
+    import strategies as strat_config
+    strat_config.print_strategies()
+
+
+def _cmd_sell(args: List[str]):
+    idx = args.index("--sell")
+    if idx + 1 < len(args):
+        manual_sell(args[idx + 1])
+    else:
+        print("Usage: python bot.py --sell <search_term>")
+
+
+def _cmd_paper(args: List[str]):
+    use_cache = "--no-cache" not in args
+    args = [a for a in args if a != "--no-cache"]
+    idx = args.index("--paper")
+    strategy_name = args[idx + 1] if idx + 1 < len(args) else None
+    run_paper_trading(strategy_name, use_cache=use_cache)
+
+
+# Flag -> handler, checked in this order (first flag present wins).
+# Handlers import what they need, so cheap commands stay cheap.
+_COMMANDS = {
+    "--help": _cmd_help,
+    "--strategies": _cmd_strategies,
+    "--sell": _cmd_sell,
+    "--paper": _cmd_paper,
+}
+
+
+def _main(args: List[str]):
+    if not args:
+        return _cmd_help(args)
     
-    if "--paper" in args:
-        idx = args.index("--paper")
-        strategy_name = args[idx + 1] if idx + 1 < len(args) else None
-        run_paper_trading(strategy_name)
-        return
+    for flag, handler in _COMMANDS.items():
+        if flag in args:
+            return handler(args)
     
     print("Unknown command. Use --help for usage.")
 
@@ -21,6 +21,7 @@ import os
 import sys
 import json
 import argparse
+import time
 import requests
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
@@ -44,6 +45,9 @@ GAMMA_API_BASE = "https://gamma-api.polymarket.com"
 DEFAULT_LIMIT = 8000
 DEFAULT_PAGE_SIZE = 100
 
+# One keep-alive connection for all pages (~80 requests per snapshot)
+SESSION = requests.Session()
+
 
 # =============================================================================
 # API FUNCTIONS (standalone, no dependency on api.py)
@@ -71,7 +75,7 @@ def fetch_open_markets(limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
                 "offset": offset,
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = SESSION.get(url, params=params, timeout=30)
             response.raise_for_status()
             
             markets = response.json()
@@ -103,7 +107,7 @@ def fetch_open_markets(limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
 
 def log(msg: str, level: str = "INFO"):
     """Simple logging with timestamp."""
-    ts = datetime.now().strftime("%H:%M:%S")
+    ts = time.strftime("%H:%M:%S")
     print(f"[{ts}] [{level}] {msg}")
 
 
@@ -125,8 +129,8 @@ def collect_snapshot(
     Returns:
         Stats dict
     """
-    run_ts = datetime.now(timezone.utc).timestamp()
-    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    run_ts = time.time()
+    run_id = time.strftime("%Y%m%d_%H%M%S", time.gmtime(run_ts))
     git_sha = os.getenv("GITHUB_SHA", "local")[:12]
     
     log(f"Starting snapshot collection (run_id={run_id})")
@@ -530,6 +530,9 @@ CLUSTERS = {
 
 GAMMA_API_URL = "https://gamma-api.polymarket.com"
 CLOB_API_URL = "https://clob.polymarket.com"
+GAMMA_CACHE_FILE = ".gamma_cache.json"  # ETags + bodies for conditional GETs
+MARKETS_CACHE_FILE = ".cache/markets.json"  # Last full market list (see MARKETS_CACHE_TTL)
+MARKETS_CACHE_TTL = 60  # Seconds a cached market list is reused by back-to-back runs
 
 # =============================================================================
 # OPERATIONAL
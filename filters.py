@@ -84,7 +84,35 @@ GARBAGE_PATTERNS = [
     r"\bvs\.?\s+[A-Z][a-z]+\s+(heat|lakers|warriors|celtics|bulls)",  # Teams
 ]
 
-_GARBAGE_RX = [re.compile(p, re.IGNORECASE) for p in GARBAGE_PATTERNS]
+
+
+def _alternation(keywords) -> str:
+    """Regex matching any of `keywords` as a substring.
+    
+    Keywords are merged into a prefix trie ("war|warfare|warhead" becomes
+    "war(?:fare|head)?"), so the regex engine tests each position of the
+    question once per shared prefix instead of once per keyword.
+    """
+    trie: dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End-of-keyword marker
+    
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+    
+    return emit(trie)
+
+
+# One compiled scan per list instead of one `in` / search per keyword
+_GARBAGE_KW_RX = re.compile(_alternation(GARBAGE_KEYWORDS))
+_GARBAGE_RX = re.compile("|".join(f"(?:{p})" for p in GARBAGE_PATTERNS), re.IGNORECASE)
 
 
 def is_garbage(question: str) -> Tuple[bool, str]:
@@ -99,15 +127,17 @@ def is_garbage(question: str) -> Tuple[bool, str]:
     
     q = question.lower()
     
-    # Check keywords
-    for kw in GARBAGE_KEYWORDS:
-        if kw in q:
-            return True, f"garbage_kw:{kw}"
+    # Check keywords: the regex only says whether one matches (it reports the
+    # longest match, e.g. "pga championship"); the loop names the same keyword
+    # as before, since the reason is saved in snapshots as capture_reason
+    if _GARBAGE_KW_RX.search(q):
+        for kw in GARBAGE_KEYWORDS:
+            if kw in q:
+                return True, f"garbage_kw:{kw}"
     
     # Check patterns
-    for rx in _GARBAGE_RX:
-        if rx.search(q):
-            return True, f"garbage_pattern"
+    if _GARBAGE_RX.search(q):
+        return True, f"garbage_pattern"
     
     return False, ""
 
@@ -231,28 +261,23 @@ _ENTITY_WB_PATTERNS = {
     for kw in ENTITIES_WORD_BOUNDARY
 }
 
+# Single-pass versions used by is_geopolitical (word-boundary entities and
+# substring entities share one regex)
+_ENTITY_RX = re.compile(
+    r'\b(?:' + _alternation(ENTITIES_WORD_BOUNDARY) + r')\b|' + _alternation(ENTITIES_SAFE),
+    re.IGNORECASE,
+)
+_ACTION_RX = re.compile(_alternation(ACTIONS))
+
 
 def _has_entity(q: str) -> bool:
     """Check if text contains a geopolitical entity."""
-    # Check word-boundary entities
-    for kw, pattern in _ENTITY_WB_PATTERNS.items():
-        if pattern.search(q):
-            return True
-    
-    # Check safe entities (substring match)
-    for kw in ENTITIES_SAFE:
-        if kw in q:
-            return True
-    
-    return False
+    return _ENTITY_RX.search(q) is not None
 
 
 def _has_action(q: str) -> bool:
     """Check if text contains a geopolitical action."""
-    for kw in ACTIONS:
-        if kw in q:
-            return True
-    return False
+    return _ACTION_RX.search(q) is not None
 
 
 def is_geopolitical(question: str) -> bool:
@@ -352,6 +377,10 @@ CLUSTERS = {
 }
 
 
+# One regex per cluster, kept in CLUSTERS order (first cluster wins)
+_CLUSTER_RX = [(name, re.compile(_alternation(kws))) for name, kws in CLUSTERS.items()]
+
+
 def get_cluster(question: str) -> str:
     """
     Assign a geopolitical cluster to a market.
@@ -363,10 +392,9 @@ def get_cluster(question: str) -> str:
     q = question.lower()
     
     # Check clusters in priority order
-    for cluster_name, keywords in CLUSTERS.items():
-        for kw in keywords:
-            if kw in q:
-                return cluster_name
+    for cluster_name, rx in _CLUSTER_RX:
+        if rx.search(q):
+            return cluster_name
     
     return "other"
 
@@ -399,8 +427,10 @@ def classify_market(question: str) -> MarketClassification:
             capture_reason=junk_reason,
         )
     
-    # Check geopolitical
-    is_geo = is_geopolitical(question)
+    # Check geopolitical (same as is_geopolitical, minus the garbage check
+    # already done above)
+    q = question.lower()
+    is_geo = _has_entity(q) and _has_action(q)
     cluster = get_cluster(question) if is_geo else "other"
     
     return MarketClassification(
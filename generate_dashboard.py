@@ -15,10 +15,17 @@ import json
 import os
 import time
 import glob
+import heapq
 import requests
 from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Any
 
+# ~25 portfolio files are parsed per build (orjson when installed)
+from jsonio import loads as _json_loads
+
+
 # =============================================================================
 # CONFIG
 # =============================================================================
@@ -28,6 +35,11 @@ HISTORY_FILE = "pnl_history.json"
 PENDING_TRADES_FILE = "pending_trades.json"
 LIVE_PORTFOLIO_FILE = "live_portfolio.json"
 
+# Keep-alive session: the per-market fetch loop reuses one connection
+# instead of a TLS handshake per market (retries: connection errors only)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.3)))
+
 
 def compact_history(history: list) -> list:
     if len(history) < 10:
@@ -58,8 +70,8 @@ def discover_portfolios() -> Dict[str, dict]:
         if strat_key.startswith("live") or strat_key == "test_live":
             continue
         try:
-            with open(filepath) as f:
-                data = json.load(f)
+            with open(filepath, "rb") as f:
+                data = _json_loads(f.read())
             portfolios[strat_key] = data
         except Exception as e:
             print(f"[WARN] Failed to load {filepath}: {e}")
@@ -70,8 +82,8 @@ def load_pending_trades() -> list:
     if not os.path.exists(PENDING_TRADES_FILE):
         return []
     try:
-        with open(PENDING_TRADES_FILE) as f:
-            return json.load(f)
+        with open(PENDING_TRADES_FILE, "rb") as f:
+            return _json_loads(f.read())
     except:
         return []
 
@@ -80,8 +92,8 @@ def load_live_portfolio() -> dict:
     if not os.path.exists(LIVE_PORTFOLIO_FILE):
         return {"positions": [], "total_pnl": 0, "wins": 0, "losses": 0}
     try:
-        with open(LIVE_PORTFOLIO_FILE) as f:
-            return json.load(f)
+        with open(LIVE_PORTFOLIO_FILE, "rb") as f:
+            return _json_loads(f.read())
     except:
         return {"positions": [], "total_pnl": 0, "wins": 0, "losses": 0}
 
@@ -93,15 +105,15 @@ def discover_live_portfolios() -> Dict[str, dict]:
         strat_key = filepath.replace("portfolio_", "").replace(".json", "")
         if strat_key.startswith("test_live") or strat_key == "live":
             try:
-                with open(filepath) as f:
-                    portfolios[strat_key] = json.load(f)
+                with open(filepath, "rb") as f:
+                    portfolios[strat_key] = _json_loads(f.read())
             except:
                 pass
     # Also check live_portfolio.json
     if os.path.exists(LIVE_PORTFOLIO_FILE):
         try:
-            with open(LIVE_PORTFOLIO_FILE) as f:
-                portfolios["live_executed"] = json.load(f)
+            with open(LIVE_PORTFOLIO_FILE, "rb") as f:
+                portfolios["live_executed"] = _json_loads(f.read())
         except:
             pass
     return portfolios
@@ -149,7 +161,7 @@ def batch_fetch_markets(market_ids: set) -> Dict[str, dict]:
     print(f"[INFO] Fetching {len(ids_list)} unique markets...")
     for i, mid in enumerate(ids_list):
         try:
-            resp = requests.get(f"{GAMMA_API}/markets/{mid}", timeout=10)
+            resp = SESSION.get(f"{GAMMA_API}/markets/{mid}", timeout=10)
             if resp.status_code != 200:
                 continue
             m = resp.json()
@@ -180,8 +192,8 @@ def batch_fetch_markets(market_ids: set) -> Dict[str, dict]:
 
 def update_pnl_history(portfolios: Dict[str, dict], market_data: Dict[str, dict]):
     try:
-        with open(HISTORY_FILE) as f:
-            history = json.load(f)
+        with open(HISTORY_FILE, "rb") as f:
+            history = _json_loads(f.read())
     except:
         history = []
 
@@ -504,7 +516,7 @@ def generate_html(
 </tr>\n"""
 
         closed_rows = ""
-        for pos in sorted(s["closed_trades"], key=lambda p: p.get("close_date") or p.get("entry_date", ""), reverse=True)[:30]:
+        for pos in heapq.nlargest(30, s["closed_trades"], key=lambda p: p.get("close_date") or p.get("entry_date", "")):
             question = (pos.get("question") or "")[:60]
             ep = pos.get("entry_price", 0)
             bs = pos.get("bet_side", "NO")
@@ -4,10 +4,13 @@ Quick text report - run locally anytime:
     python generate_report.py
 """
 
-import json
 import glob
+import heapq
 from datetime import datetime
 
+from jsonio import loads as _json_loads  # orjson when installed
+
+
 def main():
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
     lines = []
@@ -30,8 +33,8 @@ def main():
     for filepath in portfolios:
         strat_key = filepath.replace("portfolio_", "").replace(".json", "")
         try:
-            with open(filepath) as f:
-                data = json.load(f)
+            with open(filepath, "rb") as f:
+                data = _json_loads(f.read())
         except:
             continue
 
@@ -128,7 +131,7 @@ def main():
             t["_strat"] = s["key"]
             all_closed.append(t)
 
-    recent = sorted(all_closed, key=lambda t: t.get("close_date", ""), reverse=True)[:15]
+    recent = heapq.nlargest(15, all_closed, key=lambda t: t.get("close_date", ""))
     if recent:
         for t in recent:
             emoji = "WIN " if t.get("resolution") == "win" else "LOSS"
@@ -0,0 +1,32 @@
+"""
+JSON file I/O shared by the bot, the snapshot tools and the report scripts.
+
+Files are always written by the stdlib json module, so NaN/Infinity
+survive a round trip. orjson is optional and only speeds up reading; it
+rejects those literals, so such files fall back to json.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON bytes/str, accepting NaN/Infinity like json.loads."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumpb(obj, indent=None, default=None) -> bytes:
+    """Serialize with json: NaN/Infinity are kept (orjson would silently
+    write null) and non-ASCII is \\u-escaped. Compact unless indent is
+    given: snapshots are read by scripts, portfolios are diffed."""
+    separators = None if indent else (",", ":")
+    return json.dumps(obj, indent=indent, separators=separators, default=default).encode("utf-8")
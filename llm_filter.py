@@ -20,6 +20,7 @@ Usage:
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -29,6 +30,12 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 MODEL = "gpt-4o-mini"
 API_URL = "https://api.openai.com/v1/chat/completions"
+LLM_WORKERS = 4  # concurrent batch requests
+
+# Batches share keep-alive connections (one per worker) instead of a new
+# TLS handshake per request. POSTs are never retried.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=LLM_WORKERS))
 
 REGION_TO_CLUSTER = {
     "ukraine-russia": "ukraine",
@@ -171,8 +178,8 @@ def llm_classify_candidates(candidates: list, batch_size: int = 100) -> Tuple[li
     valid = []
     rejected = []
 
-    # Parallel LLM calls (up to 4 concurrent)
-    with ThreadPoolExecutor(max_workers=4) as pool:
+    # Parallel LLM calls (up to LLM_WORKERS concurrent)
+    with ThreadPoolExecutor(max_workers=LLM_WORKERS) as pool:
         futures = {
             pool.submit(_classify_batch, batch, api_key): i
             for i, batch in enumerate(batches)
@@ -202,7 +209,7 @@ def _classify_batch(candidates: list, api_key: str) -> Tuple[list, list]:
 
     # API call
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             API_URL,
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -6,22 +6,41 @@ Persists state to portfolio.json between runs.
 Supports multiple strategies with separate portfolios.
 """
 
-import json
+import heapq
 import os
+import sys
+import time
+import queue
+import atexit
+import threading
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
 
 import config
 import strategies as strat_config
+from jsonio import loads as _json_loads, dumpb
+
+
+def _json_dumpb(obj: Any) -> bytes:
+    """Portfolio files are committed and diffed: indent=2, byte-for-byte as
+    json.dump wrote them before."""
+    return dumpb(obj, indent=2, default=_position_dict)
+
 
 PORTFOLIO_FILE = "portfolio.json"  # Default, can be overridden
 
+# Positions are loaded by the thousand (every strategy, open + closed):
+# __slots__ saves memory and speeds up attribute access (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 # =============================================================================
 # DATA STRUCTURES
 # =============================================================================
 
-@dataclass
+@dataclass(**_SLOTS)
 class PaperPosition:
     market_id: str
     question: str
@@ -41,7 +60,17 @@ class PaperPosition:
     price_yes_current: Optional[float] = None  # Current YES price
 
 
-@dataclass
+# PaperPosition fields are all flat values: one attrgetter call builds the
+# same dict as asdict() without its recursive deep copy
+_POSITION_FIELDS = tuple(f.name for f in fields(PaperPosition))
+_get_position_fields = attrgetter(*_POSITION_FIELDS)
+
+
+def _position_dict(pos: PaperPosition) -> Dict[str, Any]:
+    return dict(zip(_POSITION_FIELDS, _get_position_fields(pos)))
+
+
+@dataclass(**_SLOTS)
 class PaperPortfolio:
     bankroll_initial: float
     bankroll_current: float
@@ -56,6 +85,15 @@ class PaperPortfolio:
     wins: int = 0
     losses: int = 0
     total_pnl: float = 0.0
+    
+    # Index of positions that were open at load time or bought since, so
+    # open-position scans skip the closed history in `positions`. May still
+    # hold positions settled since: always check status (not saved).
+    open_positions: List[PaperPosition] = field(default_factory=list, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not self.open_positions:
+            self.open_positions = [p for p in self.positions if p.status == "open"]
 
 
 # =============================================================================
@@ -78,8 +116,8 @@ def load_portfolio(portfolio_file: str = PORTFOLIO_FILE,
     
     if os.path.exists(portfolio_file):
         try:
-            with open(portfolio_file, "r") as f:
-                data = json.load(f)
+            with open(portfolio_file, "rb") as f:
+                data = _json_loads(f.read())
             
             # Reconstruct positions
             positions = [PaperPosition(**p) for p in data.get("positions", [])]
@@ -126,8 +164,8 @@ def save_portfolio(portfolio: PaperPortfolio, portfolio_file: str = PORTFOLIO_FI
         "bankroll_initial": portfolio.bankroll_initial,
         "bankroll_current": portfolio.bankroll_current,
         "entry_cost_rate": portfolio.entry_cost_rate,
-        "positions": [asdict(p) for p in portfolio.positions],
-        "closed_trades": [asdict(p) for p in portfolio.closed_trades],
+        "positions": portfolio.positions,
+        "closed_trades": portfolio.closed_trades,
         "created_at": portfolio.created_at,
         "last_updated": portfolio.last_updated,
         "total_trades": portfolio.total_trades,
@@ -136,32 +174,103 @@ def save_portfolio(portfolio: PaperPortfolio, portfolio_file: str = PORTFOLIO_FI
         "total_pnl": portfolio.total_pnl,
     }
     
-    with open(portfolio_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # Atomic replace: a crash mid-write never leaves a truncated portfolio
+    tmp = portfolio_file + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_json_dumpb(data))
+    os.replace(tmp, portfolio_file)
     
     print(f"[INFO] Portfolio saved to {portfolio_file}")
 
 
+class PortfolioWriter:
+    """Write-behind save_portfolio(): saves run on one background thread.
+    
+    submit() returns immediately; repeated submits of the same file before
+    it is written collapse into one write of the latest portfolio. Call
+    join() before anything that needs the files on disk, and close() when
+    done: it writes what is left and stops the thread (it also runs at
+    exit if never called). Don't mutate a portfolio after submitting it.
+    """
+    
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: Dict[str, PaperPortfolio] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, portfolio: PaperPortfolio, portfolio_file: str):
+        with self._lock:
+            queued = portfolio_file in self._pending
+            self._pending[portfolio_file] = portfolio
+        if not queued:
+            self._queue.put(portfolio_file)
+    
+    def join(self):
+        """Block until every submitted portfolio has been written."""
+        self._queue.join()
+    
+    def close(self):
+        """Write everything submitted, then stop the writer thread."""
+        if self._thread is None:
+            return
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+    
+    def _run(self):
+        while True:
+            portfolio_file = self._queue.get()
+            if portfolio_file is None:
+                self._queue.task_done()
+                return
+            try:
+                with self._lock:
+                    portfolio = self._pending.pop(portfolio_file)
+                save_portfolio(portfolio, portfolio_file)
+            except Exception as e:
+                print(f"[ERROR] Could not save portfolio {portfolio_file}: {e}")
+            finally:
+                self._queue.task_done()
+
+
 # =============================================================================
 # PAPER TRADING LOGIC
 # =============================================================================
 
+_minute_stamp = (-1, "")  # (epoch minute, formatted) of the last call
+
+
+def _now_minute() -> str:
+    """Local time as "%Y-%m-%d %H:%M" (entry/close dates), formatted once
+    per minute rather than once per position."""
+    global _minute_stamp
+    minute = int(time.time() // 60)
+    if _minute_stamp[0] != minute:
+        _minute_stamp = (minute, time.strftime("%Y-%m-%d %H:%M", time.localtime(minute * 60)))
+    return _minute_stamp[1]
+
+
 def get_open_exposure(portfolio: PaperPortfolio) -> tuple[float, Dict[str, float]]:
     """Calculate current exposure from open positions."""
     total = 0.0
-    by_cluster = {}
+    by_cluster: Dict[str, float] = Counter()
     
-    for pos in portfolio.positions:
+    for pos in portfolio.open_positions:
         if pos.status == "open":
-            total += pos.size_usd
-            by_cluster[pos.cluster] = by_cluster.get(pos.cluster, 0) + pos.size_usd
+            size = pos.size_usd
+            total += size
+            by_cluster[pos.cluster] += size
     
     return total, by_cluster
 
 
 def get_open_market_ids(portfolio: PaperPortfolio) -> set:
     """Get set of market IDs we already have positions in."""
-    return {pos.market_id for pos in portfolio.positions if pos.status == "open"}
+    return {pos.market_id for pos in portfolio.open_positions if pos.status == "open"}
 
 
 def paper_buy(
@@ -194,7 +303,7 @@ def paper_buy(
         question=question,
         token_id=token_id,
         bet_side=bet_side,
-        entry_date=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        entry_date=_now_minute(),
         entry_price=entry_price,
         size_usd=size_usd,
         shares=shares,
@@ -204,6 +313,7 @@ def paper_buy(
     )
     
     portfolio.positions.append(position)
+    portfolio.open_positions.append(position)
     portfolio.total_trades += 1
     
     print(f"[PAPER] Bought {bet_side} @ {entry_price:.1%} for ${size_usd:.2f} ({shares:.2f} shares)")
@@ -212,14 +322,30 @@ def paper_buy(
     return position
 
 
+def _outcome_prices(market_data: Dict) -> tuple[list, list]:
+    """(outcomePrices, outcomes) as lists; Gamma sends them as JSON strings."""
+    prices_raw = market_data.get("outcomePrices", "")
+    outcomes_raw = market_data.get("outcomes", "")
+    
+    if isinstance(prices_raw, str) and prices_raw:
+        prices = _json_loads(prices_raw)
+    else:
+        prices = prices_raw or []
+    
+    if isinstance(outcomes_raw, str) and outcomes_raw:
+        outcomes = _json_loads(outcomes_raw)
+    else:
+        outcomes = outcomes_raw or []
+    
+    return prices, outcomes
+
+
 def check_resolution(market_data: Dict) -> Optional[str]:
     """Check if a market has been resolved and return outcome.
     
     Returns:
         "yes" if YES won, "no" if NO won, None if not resolved
     """
-    import json as json_lib
-    
     # Check if market is closed/resolved
     is_closed = market_data.get("closed") == True or market_data.get("closed") == "true"
     is_resolved = market_data.get("resolved") == True or market_data.get("resolved") == "true"
@@ -246,19 +372,8 @@ def check_resolution(market_data: Dict) -> Optional[str]:
             return "no"
     
     # Method 3: Check outcomePrices - if one is 1.0 and other is 0.0
-    prices_raw = market_data.get("outcomePrices", "")
-    outcomes_raw = market_data.get("outcomes", "")
-    
     try:
-        if isinstance(prices_raw, str) and prices_raw:
-            prices = json_lib.loads(prices_raw)
-        else:
-            prices = prices_raw or []
-        
-        if isinstance(outcomes_raw, str) and outcomes_raw:
-            outcomes = json_lib.loads(outcomes_raw)
-        else:
-            outcomes = outcomes_raw or []
+        prices, outcomes = _outcome_prices(market_data)
         
         if len(prices) >= 2:
             # Check if prices indicate resolution (one is ~1, other is ~0)
@@ -315,7 +430,7 @@ def settle_position(position: PaperPosition, outcome: str) -> float:
         position.resolution = "lose"
     
     position.status = "closed"
-    position.close_date = datetime.now().strftime("%Y-%m-%d %H:%M")
+    position.close_date = _now_minute()
     position.pnl = pnl
     
     return pnl
@@ -328,9 +443,7 @@ def update_current_prices(portfolio: PaperPortfolio, market_lookup: Dict[str, An
         portfolio: The portfolio to update
         market_lookup: Dict mapping market_id to market data
     """
-    import json as json_lib
-    
-    for pos in portfolio.positions:
+    for pos in portfolio.open_positions:
         if pos.status != "open":
             continue
         
@@ -339,19 +452,7 @@ def update_current_prices(portfolio: PaperPortfolio, market_lookup: Dict[str, An
             continue
         
         try:
-            # Parse prices
-            prices_raw = market_data.get("outcomePrices", "")
-            outcomes_raw = market_data.get("outcomes", "")
-            
-            if isinstance(prices_raw, str) and prices_raw:
-                prices = json_lib.loads(prices_raw)
-            else:
-                prices = prices_raw or []
-            
-            if isinstance(outcomes_raw, str) and outcomes_raw:
-                outcomes = json_lib.loads(outcomes_raw)
-            else:
-                outcomes = outcomes_raw or []
+            prices, outcomes = _outcome_prices(market_data)
             
             # Find YES price
             price_yes = None
@@ -379,6 +480,7 @@ def update_portfolio_stats(portfolio: PaperPortfolio):
     portfolio.losses = sum(1 for t in portfolio.closed_trades if t.resolution == "lose")
     portfolio.total_pnl = sum(t.pnl for t in portfolio.closed_trades if t.pnl is not None)
     portfolio.bankroll_current = portfolio.bankroll_initial + portfolio.total_pnl
+    portfolio.open_positions = [p for p in portfolio.open_positions if p.status == "open"]
 
 
 # =============================================================================
@@ -406,7 +508,7 @@ def print_portfolio_summary(portfolio: PaperPortfolio, strategy_name: str = ""):
     print(f"Total trades: {portfolio.total_trades}")
     print(f"Closed: {len(portfolio.closed_trades)} (W:{portfolio.wins} / L:{portfolio.losses})")
     print(f"Win rate: {portfolio.wins / len(portfolio.closed_trades) * 100:.1f}%" if portfolio.closed_trades else "Win rate: N/A")
-    print(f"Open positions: {len([p for p in portfolio.positions if p.status == 'open'])}")
+    print(f"Open positions: {sum(1 for p in portfolio.open_positions if p.status == 'open')}")
     print(f"Current exposure: ${exposure_total:,.2f} ({exposure_total/portfolio.bankroll_current*100:.1f}%)")
     
     if exposure_by_cluster:
@@ -419,7 +521,7 @@ def print_portfolio_summary(portfolio: PaperPortfolio, strategy_name: str = ""):
 
 def print_open_positions(portfolio: PaperPortfolio):
     """Print list of open positions."""
-    open_pos = [p for p in portfolio.positions if p.status == "open"]
+    open_pos = [p for p in portfolio.open_positions if p.status == "open"]
     
     if not open_pos:
         print("\n[INFO] No open positions")
@@ -436,7 +538,7 @@ def print_open_positions(portfolio: PaperPortfolio):
 
 def print_recent_trades(portfolio: PaperPortfolio, n: int = 10):
     """Print recent closed trades."""
-    recent = sorted(portfolio.closed_trades, key=lambda x: x.close_date or "", reverse=True)[:n]
+    recent = heapq.nlargest(n, portfolio.closed_trades, key=lambda x: x.close_date or "")
     
     if not recent:
         print("\n[INFO] No closed trades yet")
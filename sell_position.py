@@ -6,9 +6,12 @@ Usage: python sell_position.py <market_id>
 
 import json
 import sys
-import requests
 from datetime import datetime
 
+import api  # Shared keep-alive session with retries
+
+from jsonio import loads as _json_loads  # orjson when installed
+
 
 def main():
     if len(sys.argv) < 2:
@@ -25,8 +28,8 @@ def main():
     for strat in strategies:
         filepath = f"portfolio_{strat}.json"
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            with open(filepath, "rb") as f:
+                data = _json_loads(f.read())
             
             for pos in data.get('positions', []):
                 if str(pos.get('market_id')) == str(market_id) and pos.get('status') == 'open':
@@ -60,19 +63,11 @@ def main():
     # Fetch current price
     print("📊 Fetching current price...")
     try:
-        resp = requests.get(
-            f"https://gamma-api.polymarket.com/markets/{market_id}",
-            timeout=10
-        )
-        market = resp.json()
-        
-        prices_raw = market.get('outcomePrices', '')
-        if isinstance(prices_raw, str) and prices_raw:
-            prices = json.loads(prices_raw)
-        else:
-            prices = prices_raw or []
+        market = api.fetch_market_by_id(market_id)
+        if market is None:
+            raise ValueError(f"market {market_id} not found")
         
-        current_yes = float(prices[0]) if prices else None
+        current_yes = api.parse_price_yes(market)
     except Exception as e:
         print(f"❌ Error fetching price: {e}")
         sys.exit(1)
@@ -13,12 +13,15 @@ Usage:
     from snapshot import save_snapshot, load_snapshot, list_snapshots
 """
 
+import heapq
 import json
 import os
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 
+from jsonio import loads as _json_loads, dumpb as _json_dumpb
+
 SNAPSHOTS_DIR = "snapshots"
 
 # =============================================================================
@@ -137,11 +140,11 @@ def create_market_snapshot(
     if spread is None and market.get("bestBid") and market.get("bestAsk"):
         try:
             spread = float(market.get("bestAsk", 0)) - float(market.get("bestBid", 0))
-        except:
+        except (ValueError, TypeError):
             pass
     
     return MarketSnapshot(
-        market_id=str(market.get("id", market.get("conditionId", ""))),
+        market_id=str(market["id"] if "id" in market else market.get("conditionId", "")),
         question=market.get("question", "")[:200],
         price_yes=price_yes,
         price_no=price_no,
@@ -200,8 +203,8 @@ def save_snapshot(
     
     filepath = os.path.join(SNAPSHOTS_DIR, f"snapshot_{run_id}.json")
     
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(filepath, "wb") as f:
+        f.write(_json_dumpb(data))
     
     print(f"[SNAPSHOT] Saved {len(markets)} markets to {filepath}")
     return filepath
@@ -214,8 +217,8 @@ def save_snapshot(
 def load_snapshot(filepath: str) -> Optional[RunSnapshot]:
     """Load a snapshot from disk."""
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            data = _json_loads(f.read())
         
         markets = [MarketSnapshot(**m) for m in data.get("markets", [])]
         
@@ -232,6 +235,41 @@ def load_snapshot(filepath: str) -> Optional[RunSnapshot]:
         return None
 
 
+def load_snapshot_header(filepath: str, chunk_size: int = 4096) -> Optional[Dict[str, Any]]:
+    """Read only the header fields (run_id, timestamp, counts, note).
+    
+    save_snapshot writes the scalar fields before the "markets" array, so
+    only the start of the file is read and parsed. Falls back to a full
+    load_snapshot() for files laid out differently.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            head = b""
+            while b'"markets"' not in head:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                head += chunk
+        idx = head.find(b'"markets"')
+        if idx > 0:
+            header = _json_loads(head[:idx].rstrip().rstrip(b",") + b"}")
+            if isinstance(header, dict) and "run_id" in header and "timestamp" in header:
+                return header
+    except (OSError, ValueError):
+        pass
+    
+    snap = load_snapshot(filepath)
+    if snap is None:
+        return None
+    return {
+        "timestamp": snap.timestamp,
+        "run_id": snap.run_id,
+        "total_markets_scanned": snap.total_markets_scanned,
+        "geo_markets_found": snap.geo_markets_found,
+        "note": snap.note,
+    }
+
+
 def list_snapshots() -> List[str]:
     """List all available snapshot files."""
     if not os.path.exists(SNAPSHOTS_DIR):
@@ -267,24 +305,21 @@ def filter_snapshot_by_strategy(
     
     Useful for backtesting: "what would strategy X have seen?"
     """
-    filtered = []
-    
-    for market in snapshot.markets:
-        # Price filter
-        if not (price_yes_min <= market.price_yes <= price_yes_max):
-            continue
-        
-        # Volume filter
-        if not (min_volume <= market.volume <= max_volume):
-            continue
-        
-        # Cluster filter
-        if clusters and market.cluster not in clusters:
-            continue
-        
-        filtered.append(market)
-    
-    return filtered
+    if clusters:
+        if not isinstance(clusters, (set, frozenset)):
+            clusters = frozenset(clusters)
+        return [
+            m for m in snapshot.markets
+            if price_yes_min <= m.price_yes <= price_yes_max
+            and min_volume <= m.volume <= max_volume
+            and m.cluster in clusters
+        ]
+    
+    return [
+        m for m in snapshot.markets
+        if price_yes_min <= m.price_yes <= price_yes_max
+        and min_volume <= m.volume <= max_volume
+    ]
 
 
 def compare_snapshots(snap1: RunSnapshot, snap2: RunSnapshot) -> Dict[str, Any]:
@@ -352,9 +387,9 @@ if __name__ == "__main__":
         else:
             print(f"Found {len(snapshots)} snapshots:")
             for s in snapshots[-10:]:  # Last 10
-                snap = load_snapshot(s)
-                if snap:
-                    print(f"  {snap.run_id}: {snap.geo_markets_found} markets @ {snap.timestamp[:16]}")
+                header = load_snapshot_header(s)
+                if header:
+                    print(f"  {header['run_id']}: {header.get('geo_markets_found', 0)} markets @ {header['timestamp'][:16]}")
     
     elif cmd == "show" and len(sys.argv) > 2:
         snap = load_snapshot(sys.argv[2])
@@ -364,7 +399,7 @@ if __name__ == "__main__":
             print(f"Markets scanned: {snap.total_markets_scanned}")
             print(f"Geo markets: {snap.geo_markets_found}")
             print(f"\nTop 10 by volume:")
-            for m in sorted(snap.markets, key=lambda x: x.volume, reverse=True)[:10]:
+            for m in heapq.nlargest(10, snap.markets, key=lambda x: x.volume):
                 print(f"  YES={m.price_yes:.1%} Vol=${m.volume:,.0f} [{m.cluster}] {m.question[:50]}...")
     
     elif cmd == "compare" and len(sys.argv) > 3:
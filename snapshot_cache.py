@@ -0,0 +1,287 @@
+"""
+POLYMARKET BOT - Snapshot Cache
+================================
+Persistent cache of parsed snapshots for backtesting.
+
+Snapshot JSON files never change once written, so each one is parsed once
+and kept as a pickled RunSnapshot under .cache/snapshots/, keyed on
+(path, mtime, size). A small index.json keeps run_id / timestamp /
+geo_markets_found per file, so listing snapshots needs no parsing at all.
+
+Backtest results are cached the same way under .cache/backtest/, keyed on
+the snapshot file signature plus the strategy parameters.
+
+Pickles live in a per-generation directory named after a hash of the code
+that produced them (see _SNAPSHOT_SOURCES / _RESULT_SOURCES): editing the
+parser, the analysis or the strategy definitions starts a fresh cache, and
+prune_cache() deletes old generations and entries for removed snapshots.
+
+index.json is only written by the parent process, once per run
+(save_index / update_index): load workers return the fields they read.
+
+Usage:
+    from snapshot_cache import load_snapshot_cached, snapshot_summary, save_index
+    from snapshot_cache import load_result, store_result, prune_cache
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from snapshot import load_snapshot, load_snapshot_header, RunSnapshot
+
+CACHE_DIR = os.path.join(".cache", "snapshots")
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+RESULTS_DIR = os.path.join(".cache", "backtest")
+
+# Modules whose code decides what a cached pickle contains: parsing for
+# snapshots; parsing, analysis (BacktestResult included) and strategy
+# definitions for results
+_SNAPSHOT_SOURCES = ("snapshot.py", "jsonio.py")
+_RESULT_SOURCES = _SNAPSHOT_SOURCES + ("backtest.py", "strategies.py", "config.py")
+
+_index: Optional[Dict[str, Dict]] = None
+_index_dirty = False
+_generations: Dict[Tuple[str, ...], str] = {}
+
+
+def _generation(sources: Tuple[str, ...]) -> str:
+    """Short hash of the given modules' source (computed once per process)."""
+    gen = _generations.get(sources)
+    if gen is None:
+        here = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha1()
+        for name in sources:
+            h.update(name.encode())
+            try:
+                with open(os.path.join(here, name), "rb") as f:
+                    h.update(f.read())
+            except OSError:
+                pass
+        gen = _generations[sources] = h.hexdigest()[:12]
+    return gen
+
+
+def _file_sig(path: str) -> Tuple[float, int]:
+    st = os.stat(path)
+    return st.st_mtime, st.st_size
+
+
+def _snapshot_key(path: str, sig: Tuple[float, int]) -> str:
+    return hashlib.sha1(f"{path}|{sig[0]}|{sig[1]}".encode()).hexdigest()
+
+
+def _cache_path(path: str, sig: Tuple[float, int]) -> str:
+    return os.path.join(CACHE_DIR, _generation(_SNAPSHOT_SOURCES),
+                        f"{_snapshot_key(path, sig)}.pkl")
+
+
+def _load_index() -> Dict[str, Dict]:
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_FILE, "r") as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write via a per-process temp file so concurrent writers never
+    leave a half-written file behind (backtest runs in worker processes)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def save_index():
+    """Write index.json if anything changed since it was loaded."""
+    global _index_dirty
+    if not _index_dirty:
+        return
+    try:
+        _atomic_write(INDEX_FILE, json.dumps(_index).encode())
+        _index_dirty = False
+    except OSError as e:
+        print(f"[WARN] Could not save {INDEX_FILE}: {e}")
+
+
+def _remember(path: str, sig: Tuple[float, int], run_id: str, timestamp: str,
+              geo_markets_found: int):
+    """Record a snapshot's listing fields in the in-memory index."""
+    global _index_dirty
+    entry = {
+        "mtime": sig[0],
+        "size": sig[1],
+        "run_id": run_id,
+        "timestamp": timestamp,
+        "geo_markets_found": geo_markets_found,
+    }
+    index = _load_index()
+    if index.get(path) != entry:
+        index[path] = entry
+        _index_dirty = True
+
+
+def index_fields(path: str, snap: RunSnapshot) -> Optional[Tuple]:
+    """What update_index() needs for a snapshot a worker just loaded."""
+    try:
+        sig = _file_sig(path)
+    except OSError:
+        return None
+    return path, sig, snap.run_id, snap.timestamp, snap.geo_markets_found
+
+
+def update_index(fields: Iterable[Optional[Tuple]]):
+    """Record index_fields() results from workers and save the index once."""
+    for f in fields:
+        if f is not None:
+            _remember(*f)
+    save_index()
+
+
+def load_snapshot_cached(path: str) -> Optional[RunSnapshot]:
+    """load_snapshot() backed by the pickle cache (leaves the index alone,
+    so it is safe in worker processes)."""
+    try:
+        sig = _file_sig(path)
+    except OSError:
+        return load_snapshot(path)
+
+    pkl = _cache_path(path, sig)
+    snap = None
+    if os.path.exists(pkl):
+        try:
+            with open(pkl, "rb") as f:
+                snap = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            snap = None  # Corrupt or stale class layout: re-parse below
+
+    if snap is None:
+        snap = load_snapshot(path)
+        if snap is None:
+            return None
+        try:
+            _atomic_write(pkl, pickle.dumps(snap, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"[WARN] Could not cache snapshot {path}: {e}")
+    return snap
+
+
+def snapshot_summary(path: str) -> Optional[Tuple[str, str, int]]:
+    """(run_id, timestamp, geo_markets_found) for a snapshot, from the index
+    when the file is unchanged, otherwise from the file's header only.
+    New entries are kept in memory: call save_index() after the loop."""
+    try:
+        sig = _file_sig(path)
+    except OSError:
+        return None
+
+    entry = _load_index().get(path)
+    if entry and (entry["mtime"], entry["size"]) == tuple(sig):
+        return entry["run_id"], entry["timestamp"], entry["geo_markets_found"]
+
+    header = load_snapshot_header(path)
+    if header is None:
+        return None
+    summary = header["run_id"], header["timestamp"], header.get("geo_markets_found", 0)
+    _remember(path, sig, *summary)
+    return summary
+
+
+# =============================================================================
+# BACKTEST RESULTS
+# =============================================================================
+
+def _result_path(path: str, params: Dict) -> Optional[str]:
+    try:
+        sig = _file_sig(path)
+    except OSError:
+        return None
+    params_key = hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()
+    return os.path.join(RESULTS_DIR, _generation(_RESULT_SOURCES),
+                        f"{_snapshot_key(path, sig)}-{params_key}.pkl")
+
+
+def load_result(path: str, params: Dict) -> Optional[Any]:
+    """Cached analysis of snapshot `path` under strategy `params`, if any."""
+    pkl = _result_path(path, params)
+    if pkl is None or not os.path.exists(pkl):
+        return None
+    try:
+        with open(pkl, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def store_result(path: str, params: Dict, result: Any):
+    pkl = _result_path(path, params)
+    if pkl is None:
+        return
+    try:
+        _atomic_write(pkl, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError as e:
+        print(f"[WARN] Could not cache backtest result for {path}: {e}")
+
+
+# =============================================================================
+# PRUNING
+# =============================================================================
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _prune_dir(root: str, generation: str, live_keys: set):
+    """Drop other generations under root, and pickles of snapshots that are
+    gone or changed in the current one."""
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir():
+            if entry.name != generation:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            continue
+        if entry.name.endswith(".pkl"):
+            _remove(entry.path)  # Pre-generation layout
+    
+    try:
+        entries = list(os.scandir(os.path.join(root, generation)))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.endswith(".pkl") and entry.name[:40] not in live_keys:
+            _remove(entry.path)
+
+
+def prune_cache(paths: Iterable[str]):
+    """Delete cached pickles not reachable from the current code and the
+    current versions of `paths` (pass every snapshot that still exists),
+    and their index entries (written by the next save_index)."""
+    global _index_dirty
+    live_paths = set(paths)
+    live_keys = set()
+    for path in live_paths:
+        try:
+            live_keys.add(_snapshot_key(path, _file_sig(path)))
+        except OSError:
+            pass
+    _prune_dir(CACHE_DIR, _generation(_SNAPSHOT_SOURCES), live_keys)
+    _prune_dir(RESULTS_DIR, _generation(_RESULT_SOURCES), live_keys)
+    
+    index = _load_index()
+    for path in [p for p in index if p not in live_paths]:
+        del index[path]
+        _index_dirty = True
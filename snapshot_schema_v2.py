@@ -18,6 +18,8 @@ from dataclasses import dataclass, asdict, field
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+from jsonio import loads as _json_loads, dumpb as _json_dumpb
+
 
 SCHEMA_VERSION = 2
 SNAPSHOTS_DIR = "snapshots"
@@ -365,8 +367,8 @@ def save_snapshot(meta: RunMeta, markets: List[MarketSnapshot]) -> str:
         "markets": [asdict(m) for m in markets],
     }
     
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    with open(filepath, "wb") as f:
+        f.write(_json_dumpb(payload))
     
     print(f"[SNAPSHOT] Saved {len(markets)} markets to {filepath}")
     return str(filepath)
@@ -375,8 +377,8 @@ def save_snapshot(meta: RunMeta, markets: List[MarketSnapshot]) -> str:
 def load_snapshot(filepath: str) -> tuple[Optional[RunMeta], Optional[List[MarketSnapshot]]]:
     """Load a snapshot from disk."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(filepath, "rb") as f:
+            data = _json_loads(f.read())
         
         meta = RunMeta(**data["meta"])
         markets = [MarketSnapshot(**m) for m in data["markets"]]
@@ -8,6 +8,7 @@ UPDATED: Supports both old and new strategy key names:
 - New: side, price_min, price_max
 """
 
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
@@ -108,7 +109,7 @@ def is_valid_market(
     if isinstance(outcomes_raw, str):
         try:
             outcomes = _json.loads(outcomes_raw) if outcomes_raw else []
-        except:
+        except ValueError:
             outcomes = []
     else:
         outcomes = outcomes_raw or []
@@ -270,15 +271,12 @@ def calculate_exposure(positions: List[Dict]) -> Tuple[float, Dict[str, float]]:
         (total_exposure, exposure_by_cluster)
     """
     total = 0.0
-    by_cluster = {}
+    by_cluster: Dict[str, float] = Counter()
     
     for pos in positions:
-        size = float(pos.get("size", pos.get("size_usd", 0)))
-        question = pos.get("question", "")
-        cluster = get_cluster(question)
-        
+        size = float(pos["size"] if "size" in pos else pos.get("size_usd", 0))
         total += size
-        by_cluster[cluster] = by_cluster.get(cluster, 0) + size
+        by_cluster[get_cluster(pos.get("question", ""))] += size
     
     return total, by_cluster
 
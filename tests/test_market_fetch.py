@@ -0,0 +1,36 @@
+"""A listing page that keeps failing must abort the run, not truncate it."""
+
+import pytest
+
+import api
+import bot
+
+
+def test_failed_page_raises(monkeypatch):
+    calls = []
+    
+    def fail(url, params, persist=False):
+        calls.append(params["offset"])
+        return None
+    
+    monkeypatch.setattr(api, "_fetch_page", fail)
+    monkeypatch.setattr(api.time, "sleep", lambda s: None)
+    
+    with pytest.raises(api.MarketFetchError):
+        api.fetch_geo_markets_fast(max_workers=2)
+    assert calls.count(0) == api.PAGE_ATTEMPTS
+
+
+def test_paper_trading_aborts_on_fetch_error(monkeypatch):
+    def fail(limit=500, use_cache=False):
+        raise api.MarketFetchError("markets page at offset 0 failed 3 times")
+    
+    monkeypatch.setattr(api, "fetch_open_markets", fail)
+    monkeypatch.setattr(bot, "precompute_candidates",
+                        lambda *a: pytest.fail("ran on a partial market list"))
+    monkeypatch.setattr(bot, "_TG_BUFFER", [])
+    
+    bot.run_paper_trading("balanced", use_cache=False)
+    
+    assert len(bot._TG_BUFFER) == 1
+    assert "aborted" in bot._TG_BUFFER[0]